@@ -3,10 +3,11 @@ import time
 from functools import wraps
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from library.constants import Timeout
+from library.constants import Readiness, Timeout
 from library.action import Action
 from reusables import logging_config
 from reusables.custom_exception import CustomException
+from reusables.tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ def handle_exceptions_with_retry(retries=3, delay=1):
                     return func(*args, **kwargs)
                 except (NoSuchElementException, TimeoutException, ValueError) as e:
                     last_exception = e
-                    logger.error(f"{func.__name__} attempt {attempt + 1} failed: {e.__class__.__name__}")
+                    logger.error("%s attempt %s failed: %s", func.__name__, attempt + 1, e.__class__.__name__)
                     time.sleep(delay)
 
             raise CustomException(f"{func.__name__} failed after {retries} attempts.",
@@ -37,14 +38,15 @@ def handle_exceptions_with_retry(retries=3, delay=1):
 
 class Sha1OutputRead:
     def __init__(self, driver: webdriver):
-        logger.info(f"{self.__class__.__name__} initialized.")
+        logger.info("%s initialized.", self.__class__.__name__)
         self.driver = driver
         self.action = Action(driver)
 
+    @traced("page")
     @handle_exceptions_with_retry(retries=3, delay=1)
     def start(self) -> str | None:
         """Execute the read operation with pre- and post-condition checks."""
-        logger.info(f"{self.__class__.__name__} started.")
+        logger.info("%s started.", self.__class__.__name__)
         name = "Read Sha1 Output"
         selector = "//textarea[@id='output']"
         timeout = Timeout.MEDIUM
@@ -56,20 +58,18 @@ class Sha1OutputRead:
         value = self._do_action(name, selector, timeout)
 
         if self._post_condition(value):
-            logger.info(f"{self.__class__.__name__} finished successfully.")
+            logger.info("%s finished successfully.", self.__class__.__name__)
             return value
-        logger.info(f"{self.__class__.__name__} finished with errors.")
+        logger.info("%s finished with errors.", self.__class__.__name__)
         return None
 
     def _pre_condition(self, name: str, selector: str, timeout=Timeout.MEDIUM) -> bool:
         """Check if the element is present."""
-        return self.action.IsExist(name, selector, timeout=timeout)
+        return self.action.IsExist(name, selector, timeout=timeout, readiness=Readiness.ELEMENT_STABLE)
 
     def _do_action(self, name: str, selector: str, timeout=Timeout.MEDIUM) -> str:
         """Read the text from the element."""
-        return self.action.ReadElementText(
-            name, selector, timeout=timeout, delay_before=100, delay_after=100
-        )
+        return self.action.ReadElementText(name, selector, timeout=timeout)
 
     def _post_condition(self, value: str) -> bool:
         """Verify the action by checking the read value."""
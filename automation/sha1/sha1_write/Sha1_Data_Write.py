@@ -3,9 +3,10 @@ import time
 from functools import wraps
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from library.constants import Timeout
+from library.constants import Delay, Readiness, Timeout
 from library.action import Action
 from reusables.custom_exception import CustomException
+from reusables.tracer import traced
 from reusables import logging_config
 
 logger = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ def handle_exceptions_with_retry(retries=3, delay=1):
                     return func(*args, **kwargs)
                 except (NoSuchElementException, TimeoutException, ValueError) as e:
                     last_exception = e
-                    logger.error(f"{func.__name__} attempt {attempt + 1} failed: {e.__class__.__name__}")
+                    logger.error("%s attempt %s failed: %s", func.__name__, attempt + 1, e.__class__.__name__)
                     time.sleep(delay)
 
             raise CustomException(f"{func.__name__} failed after {retries} attempts.",
@@ -41,10 +42,11 @@ class Sha1DataWrite:
         self.driver = driver
         self.action = Action(driver)
 
+    @traced("page")
     @handle_exceptions_with_retry(retries=3, delay=1)
     def start(self, value) -> bool:
         """Execute the write operation with pre- and post-condition checks."""
-        logger.info(f"{self.__class__.__name__} started.")
+        logger.info("%s started.", self.__class__.__name__)
 
         name = "Write data for SHA1"
         selector = "//textarea[@id='input']"
@@ -59,26 +61,24 @@ class Sha1DataWrite:
 
         # Post-condition check
         if self._post_condition(name, selector, value, timeout):
-            logger.info(f"{self.__class__.__name__} finished successfully.")
+            logger.info("%s finished successfully.", self.__class__.__name__)
             return True
-        logger.info(f"{self.__class__.__name__} finished with errors.")
+        logger.info("%s finished with errors.", self.__class__.__name__)
         return False
 
     def _pre_condition(self, name: str, selector: str, timeout=Timeout.MEDIUM) -> bool:
         """Check if the element is present."""
-        return self.action.IsExist(name, selector, timeout=timeout)
+        return self.action.IsExist(name, selector, timeout=timeout, readiness=Readiness.ELEMENT_STABLE)
 
     def _do_action(self, name: str, selector: str, value: str, timeout=Timeout.MEDIUM):
         """Enter the specified value into the element."""
         self.action.WriteInputElement(
-            name, selector, timeout=timeout, value=value, delay_before=0, delay_after=0
+            name, selector, timeout=timeout, value=value, delay_before=0, delay_after=Delay.SHORT
         )
 
     def _post_condition(self, name: str, selector: str, value: str, timeout=Timeout.MEDIUM) -> bool:
         """Verify if the written value matches the expected value."""
-        new_value = self.action.ReadElementText(
-            name, selector, timeout=timeout, delay_before=100, delay_after=100
-        )
+        new_value = self.action.ReadElementText(name, selector, timeout=timeout)
         if value == new_value:
             return True
         raise ValueError(f"{self.__class__.__name__} verification failed: Expected '{value}', found '{new_value}'")
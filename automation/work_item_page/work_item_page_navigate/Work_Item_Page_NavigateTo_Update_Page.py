@@ -3,10 +3,11 @@ import time
 from functools import wraps
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from library.constants import ClickButton, Timeout
+from library.constants import ClickButton, Readiness, Timeout
 from library.action import Action
 from reusables import logging_config
 from reusables.custom_exception import CustomException
+from reusables.tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ def handle_exceptions_with_retry(retries=3, delay=1):
                     return func(*args, **kwargs)
                 except (NoSuchElementException, TimeoutException, ValueError) as e:
                     last_exception = e
-                    logger.error(f"{func.__name__} attempt {attempt + 1} failed: {e.__class__.__name__}")
+                    logger.error("%s attempt %s failed: %s", func.__name__, attempt + 1, e.__class__.__name__)
                     time.sleep(delay)
 
             raise CustomException(f"{func.__name__} failed after {retries} attempts.",
@@ -41,10 +42,11 @@ class WorkItemPageNavigateToUpdatePage:
         self.driver = driver
         self.action = Action(driver)
 
+    @traced("page")
     @handle_exceptions_with_retry(retries=3, delay=1)
     def start(self, second_retry=False):
         """Execute the navigation action."""
-        logger.info(f"{self.__class__.__name__} started.")
+        logger.info("%s started.", self.__class__.__name__)
 
         name = "Navigate from work item page to update page"
         selector = "//button[normalize-space()='Update Work Item']"
@@ -65,7 +67,7 @@ class WorkItemPageNavigateToUpdatePage:
 
     def _pre_condition(self, name: str, selector: str, timeout=Timeout.MEDIUM) -> bool:
         """Check if the element is present."""
-        return self.action.IsExist(name, selector, timeout=timeout)
+        return self.action.IsExist(name, selector, timeout=timeout, readiness=Readiness.ELEMENT_STABLE)
 
     def _do_action(self, name: str, selector: str, timeout=Timeout.MEDIUM):
         """Perform the action."""
@@ -73,7 +75,9 @@ class WorkItemPageNavigateToUpdatePage:
 
     def _post_condition(self, test_selector, timeout=Timeout.MEDIUM) -> bool:
         """Check if the action succeeded by reading the element value."""
-        if self.action.IsExist("Test Navigate", test_selector, timeout=timeout):
-            logger.info(f"{self.__class__.__name__} completed successfully.")
+        if self.action.IsExist(
+                "Test Navigate", test_selector, timeout=timeout, readiness=Readiness.ELEMENT_STABLE
+        ):
+            logger.info("%s completed successfully.", self.__class__.__name__)
             return True
         raise NoSuchElementException("Element not found.")
@@ -3,10 +3,11 @@ import time
 from functools import wraps
 from selenium import webdriver
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-from library.constants import ClickButton, Timeout
+from library.constants import ClickButton, Delay, Readiness, Timeout
 from library.action import Action
 from reusables import logging_config
 from reusables.custom_exception import CustomException
+from reusables.tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +24,7 @@ def handle_exceptions_with_retry(retries=3, delay=1):
                     return func(*args, **kwargs)
                 except (NoSuchElementException, TimeoutException, ValueError) as e:
                     last_exception = e
-                    logger.error(f"{func.__name__} attempt {attempt + 1} failed: {e.__class__.__name__}")
+                    logger.error("%s attempt %s failed: %s", func.__name__, attempt + 1, e.__class__.__name__)
                     time.sleep(delay)
 
             raise CustomException(f"{func.__name__} failed after {retries} attempts.",
@@ -41,10 +42,11 @@ class WorkItemUpdatePageSelect:
         self.driver = driver
         self.action = Action(driver)
 
+    @traced("page")
     @handle_exceptions_with_retry(retries=3, delay=1)
     def start(self):
         """Execute the navigation action."""
-        logger.info(f"{self.__class__.__name__} started.")
+        logger.info("%s started.", self.__class__.__name__)
 
         name = "Update work item status to Completed"
         selector = "//button[@data-id='newStatus']"
@@ -60,17 +62,17 @@ class WorkItemUpdatePageSelect:
 
     def _pre_condition(self, name: str, selector: str, timeout=Timeout.MEDIUM) -> bool:
         """Check if the element is present."""
-        return self.action.IsExist(name, selector, timeout=timeout)
+        return self.action.IsExist(name, selector, timeout=timeout, readiness=Readiness.ELEMENT_STABLE)
 
     def _do_action(self, name: str, selector: str, timeout=Timeout.MEDIUM):
         """Perform the action."""
-        self.action.Click(name=name, selector=selector, timeout=timeout, click_button=ClickButton.LEFT)
+        self.action.Click(
+            name=name, selector=selector, timeout=timeout, click_button=ClickButton.LEFT, delay_after=Delay.SHORT
+        )
 
     def _post_condition(self, name, selector, value, timeout=Timeout.MEDIUM) -> bool:
         """Check if the action succeeded by reading the element value."""
-        new_value = self.action.ReadElementText(
-            name, selector, timeout=timeout, delay_before=100, delay_after=100
-        )
+        new_value = self.action.ReadElementText(name, selector, timeout=timeout)
         if value == new_value.strip():
             return True
         raise ValueError(f"{self.__class__.__name__} verification failed: Expected '{value}', found '{new_value}'")
@@ -15,8 +15,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from library.constants import ClickButton, ClickType, Timeout
+from library import readiness as page_readiness
+from library.constants import ClickButton, ClickType, Delay, Readiness, Timeout
 from reusables import logging_config
+from reusables.tracer import traced
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +28,10 @@ class Action:
     Action class for performing actions on the web page.
     """
     HIGHLIGHT_DURATION = 0.3  # Constant for highlight duration
-    DEBUG_MODE = True  # Enable or disable debug mode globally
+    DEBUG_MODE = True  # Enable or disable debug mode globally (IsHighlight in Config.xlsx)
+    EXIST_DELAY = 500  # Milliseconds to settle before IsExist looks up the element (ExistDelay)
+    STABLE_MS = 150  # Milliseconds an element must stay unchanged for Readiness.ELEMENT_STABLE (StableMs)
+    NETWORK_IDLE_MS = 300  # Milliseconds without fetch/XHR for Readiness.NETWORK_IDLE (NetworkIdleMs)
 
     def __init__(self, driver: webdriver):
         self.driver = driver
@@ -36,9 +41,10 @@ class Action:
 
     def _wait_for_element(self, timeout: Timeout) -> WebDriverWait:
         """Wait for an element to be present in the DOM."""
-        wait = WebDriverWait(self.driver, timeout.value, poll_frequency=0.5)
+        wait = WebDriverWait(self.driver, timeout.seconds, poll_frequency=0.5)
         return wait
 
+    @traced("action", with_label=True)
     def Click(
             self,
             name,
@@ -48,6 +54,7 @@ class Action:
             click_button=ClickButton.LEFT,
             delay_before=0,
             delay_after=0,
+            navigates=False,
     ):
         """
         Perform the click action.
@@ -60,11 +67,13 @@ class Action:
             click_button (ClickButton): click button
             delay_before (int): delay before the click in milliseconds
             delay_after (int): delay after the click in milliseconds
+            navigates (bool): the click loads another page; wait until the URL changes or
+                the current document is gone, so later checks run in the new page
 
         Returns:
             bool: True if the click action was successful, False otherwise
         """
-        logger.info(f"Enter Click from {name} ...")
+        logger.info("Enter Click from %s ...", name)
         # delay before the click
         self._waitBeforeAction(delay_before)
         wait = self._wait_for_element(timeout)
@@ -74,18 +83,26 @@ class Action:
         )
         # perform the click
         # check click and button type
+        if navigates:
+            url = self.driver.current_url
+            document = self.driver.find_element(By.TAG_NAME, "html")
         match click_button:
             case ClickButton.LEFT:
                 self._HighlightElement(element)
                 element.click()
                 # logger.info(f"Clicked on {selector}")
+        if navigates:
+            WebDriverWait(self.driver, timeout.seconds, poll_frequency=0.1).until(
+                lambda driver: EC.staleness_of(document)(driver) or driver.current_url != url
+            )
 
-        logger.info(f"Exit Click from {name} ...")
+        logger.info("Exit Click from %s ...", name)
         # delay after the click
         self._waitBeforeAction(delay_after)
         return True
 
-    def IsExist(self, name, selector, timeout: Timeout = Timeout.LONG):
+    @traced("action", with_label=True)
+    def IsExist(self, name, selector, timeout: Timeout = Timeout.LONG, readiness=Readiness.NONE):
         """
         Check if the element exists.
 
@@ -93,16 +110,51 @@ class Action:
             name (str): name of action
             selector (str): selector of the element
             timeout (int): timeout in seconds
+            readiness (Readiness): what to wait for first; NONE sleeps ExistDelay
 
         Returns:
             bool: True if the element exists, False otherwise
         """
-        logger.info(f"Enter IsExist from {name} ...")
+        logger.info("Enter IsExist from %s ...", name)
         wait = self._wait_for_element(timeout)
-        self._waitBeforeAction(500)
+        if readiness is Readiness.NONE:
+            self._waitBeforeAction(self.EXIST_DELAY)
+        else:
+            self.WaitUntilReady(name, readiness, selector, timeout)
         element = wait.until(EC.presence_of_element_located((By.XPATH, selector)))
         self._HighlightElement(element)
-        logger.info(f"Exit IsExist from {name} ...")
+        logger.info("Exit IsExist from %s ...", name)
+        return True
+
+    @traced("action", with_label=True)
+    def WaitUntilReady(self, name, readiness=Readiness.ELEMENT_STABLE, selector=None,
+                       timeout: Timeout = Timeout.MEDIUM):
+        """
+        Wait in the browser until the page is ready, in a single round trip.
+
+        Args:
+            name (str): name of action
+            readiness (Readiness): NETWORK_IDLE or ELEMENT_STABLE
+            selector (str): selector of the element, required for ELEMENT_STABLE
+            timeout (Timeout): timeout duration
+
+        Returns:
+            bool: True once ready
+
+        Raises:
+            TimeoutException: if the page is not ready within the timeout
+        """
+        logger.info("Enter WaitUntilReady (%s) from %s ...", readiness.value, name)
+        match readiness:
+            case Readiness.NETWORK_IDLE:
+                ready = page_readiness.wait_for_network_idle(self.driver, self.NETWORK_IDLE_MS, timeout.seconds)
+            case Readiness.ELEMENT_STABLE:
+                ready = page_readiness.wait_for_element_stable(self.driver, selector, self.STABLE_MS, timeout.seconds)
+            case _:
+                ready = True
+        if not ready:
+            raise TimeoutException(f"{name}: page not {readiness.value} after {timeout.seconds}s")
+        logger.info("Exit WaitUntilReady from %s ...", name)
         return True
 
     # @handle_exceptions_with_retry(retries=1, delay=0)
@@ -116,12 +168,12 @@ class Action:
         Returns:
             WebElement or None: Element if found, None otherwise
         """
-        print(f"Enter {name} action selector: {selector}")
+        logger.debug("Enter %s action selector: %s", name, selector)
         if self.found_event.is_set():  # Check if element is already found
             return
 
         try:
-            wait_time = timeout.value  # Total wait time from the Timeout enum
+            wait_time = timeout.seconds  # Total wait time from the Timeout enum
             poll_interval = 0.5  # Check every 0.5 seconds
 
             for _ in range(int(wait_time / poll_interval)):
@@ -135,21 +187,22 @@ class Action:
                 with self.lock:
                     if self.result_found is None:  # Only set if no element is found yet
                         self.result_found = element  # Store the found element
-                        print(f"Exit {name} action selector: {selector} - Found element")
+                        logger.debug("Exit %s action selector: %s - Found element", name, selector)
                         self.found_event.set()  # Signal other threads to stop
                 return element  # Return after finding the element
 
         except Exception as e:
-            print(f"Error in {name} action selector: {selector}: {e}")
+            logger.debug("Error in %s action selector: %s: %s", name, selector, e)
             return None
 
+    @traced("action", with_label=True)
     def FindParallel(self, selectors):
         """
         Find existing elements in parallel.
         :param selectors: list of element selectors
         :return: the first existing element or None
         """
-        logger.info(f"Enter FindParallel ...")
+        logger.info("Enter FindParallel ...")
         threads = []
         for selector in selectors:
             t = threading.Thread(target=self._isElementExisting,
@@ -161,13 +214,14 @@ class Action:
             if t.is_alive():
                 t.join()  # Wait for all threads to finish
 
-        if self.result_found:
-            logger.info(f"Element found: {self.result_found.get_attribute('innerText')}")
-        else:
-            print("No matching element found.")
+        if self.result_found is None:
+            logger.info("No matching element found.")
+        elif logger.isEnabledFor(logging.INFO):  # reading the text is a WebDriver round trip
+            logger.info("Element found: %s", self.result_found.get_attribute('innerText'))
 
         return self.result_found  # Return the found element or None
 
+    @traced("action", with_label=True)
     def OpenUrl(
             self, name, url: str, delay_before=0, delay_after=0
     ):
@@ -182,13 +236,14 @@ class Action:
         Returns:
             bool: True if the navigation was successful, False otherwise
         """
-        logger.info(f"Enter OpenUrl from {name} ...")
+        logger.info("Enter OpenUrl from %s ...", name)
         self._waitBeforeAction(delay_before)
         self.driver.get(url)
         self._wait_after_action(delay_after)
-        logger.info(f"Exit OpenUrl from {name} ...")
+        logger.info("Exit OpenUrl from %s ...", name)
         return True
 
+    @traced("action", with_label=True)
     def ReadElementText(
             self, name, selector, timeout: Timeout = Timeout.MEDIUM, delay_before=0, delay_after=0
     ) -> str:
@@ -205,14 +260,14 @@ class Action:
         Returns:
             str: text value of the element
         """
-        logger.info(f"Enter ReadElementText from {name} ...")
+        logger.info("Enter ReadElementText from %s ...", name)
         self._waitBeforeAction(delay_before)
         wait = self._wait_for_element(timeout)
         element = wait.until(EC.presence_of_element_located((By.XPATH, selector)))
         self._HighlightElement(element)
         self._wait_after_action(delay_after)
 
-        logger.info(f"Exit ReadElementText from {name} ...")
+        logger.info("Exit ReadElementText from %s ...", name)
         # Prioritize `value` attribute, fallback to text properties.
         for attr in ["value", "text", "innerText"]:
             text = element.get_attribute(attr) or getattr(element, attr, None)
@@ -221,6 +276,7 @@ class Action:
 
         return "Element text could not be read."
 
+    @traced("action", with_label=True)
     def WriteInputElement(
             self,
             name,
@@ -245,7 +301,7 @@ class Action:
             str: text value of the element
 
         """
-        logger.info(f"Enter WriteInputElement from {name} ...")
+        logger.info("Enter WriteInputElement from %s ...", name)
         self._waitBeforeAction(delay_before)
 
         wait = self._wait_for_element(timeout)
@@ -254,9 +310,10 @@ class Action:
         element.clear()  # Ensure the field is empty before input.
         element.send_keys(value)
         self._wait_after_action(delay_after)
-        logger.info(f"Exiting WriteInputElement from {name} ...")
+        logger.info("Exiting WriteInputElement from %s ...", name)
         return True if element.get_attribute("value") else False
 
+    @traced("action", with_label=True)
     def ReadElements(
             self, name, selector, timeout: Timeout = Timeout.MEDIUM, delay_before=0, delay_after=0
     ):
@@ -273,15 +330,13 @@ class Action:
         Returns:
             list: list of elements
         """
-        print(f"Enter {name} action")
-        logger.info(f"Enter {name} action")
+        logger.info("Enter %s action", name)
         self._waitBeforeAction(delay_before)
         wait = self._wait_for_element(timeout)
         elements = wait.until(EC.presence_of_all_elements_located((By.XPATH, selector)))
         self._HighlightElement(elements[0])
         self._wait_after_action(delay_after)
-        print(f"Exit {name} action")
-        logger.info(f"Exit {name} action")
+        logger.info("Exit %s action", name)
         return elements
 
     def _HighlightElement(self, element: WebElement):
@@ -298,15 +353,20 @@ class Action:
         )
 
     def _waitBeforeAction(self, delay_before):
-        """Wait before performing an action."""
+        """Wait before performing an action (milliseconds or a Delay)."""
+        if isinstance(delay_before, Delay):
+            delay_before = delay_before.milliseconds
         if delay_before > 0:
             time.sleep(delay_before / 1000)
 
     def _wait_after_action(self, delay_after):
-        """Wait after performing an action."""
+        """Wait after performing an action (milliseconds or a Delay)."""
+        if isinstance(delay_after, Delay):
+            delay_after = delay_after.milliseconds
         if delay_after > 0:
             time.sleep(delay_after / 1000)
 
+    @traced("action", with_label=True)
     def ReadTable(self, name, selector, next_selector=None, timeout: Timeout = Timeout.MEDIUM,
                   delay_before=0, delay_after=0):
         """
@@ -320,7 +380,7 @@ class Action:
         :param next_selector: Optional selector for the "next" button if table has pagination
         :return: the data as a list of lists
         """
-        logger.info(f"Enter ReadTable from {name} ...")
+        logger.info("Enter ReadTable from %s ...", name)
         self._waitBeforeAction(delay_before)
         wait = self._wait_for_element(timeout)
         table_data = []
@@ -375,20 +435,21 @@ class Action:
                     # logger.info(f"no more tables found")
                     break
 
-        logger.info(f"Exit ReadTable from {name} ...")
+        logger.info("Exit ReadTable from %s ...", name)
         return table_data
 
-    def Handle_Alert(self, name: str, timeout=Timeout.MEDIUM, delay_before=100, delay_after=0):
+    @traced("action", with_label=True)
+    def Handle_Alert(self, name: str, timeout=Timeout.MEDIUM, delay_before=Delay.SHORT, delay_after=0):
         """
         Handle an alert.
 
         Args:
             name (str): name of action
             timeout (Timeout): timeout in seconds
-            delay_before (int): delay before the read in milliseconds
+            delay_before (int or Delay): delay before waiting for the alert in milliseconds
             delay_after (int): delay after the read in milliseconds
         """
-        logger.info(f"Enter HandleAlert from {name} ...")
+        logger.info("Enter HandleAlert from %s ...", name)
         self._waitBeforeAction(delay_before)
         wait = self._wait_for_element(timeout)
         wait.until(EC.alert_is_present())
@@ -396,5 +457,5 @@ class Action:
         text = alert.text
         alert.accept()
         self._wait_after_action(delay_after)
-        logger.info(f"Exit HandleAlert from {name} ...")
+        logger.info("Exit HandleAlert from %s ...", name)
         return text
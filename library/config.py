@@ -0,0 +1,237 @@
+"""
+Typed configuration built from Config.xlsx.
+
+The Constants sheet is validated against ``SCHEMA`` once per load, so a missing or
+mistyped variable fails at start-up instead of silently falling back to a default in
+the middle of a run. The resulting ``Config`` is frozen and slots-based; states and
+actions read plain attributes from it.
+"""
+
+import math
+from dataclasses import dataclass, field, fields
+
+from library.constants import configure_timing
+from reusables.browser_profiles import PROFILES, RESOURCE_TYPE_PATTERNS
+
+
+class ConfigError(ValueError):
+    """Raised when Config.xlsx does not match the schema."""
+
+    def __init__(self, problems):
+        super().__init__("Invalid Config.xlsx: " + "; ".join(problems))
+        self.problems = problems
+
+
+REQUIRED = object()
+
+# VariableName in the Constants sheet -> (Config field, type, default or REQUIRED)
+SCHEMA = {
+    "TimeOutS": ("timeout_short", int, REQUIRED),
+    "TimeOutM": ("timeout_medium", int, REQUIRED),
+    "TimeOutL": ("timeout_long", int, REQUIRED),
+    "DelayS": ("delay_short", int, REQUIRED),
+    "DelayM": ("delay_medium", int, REQUIRED),
+    "DelayL": ("delay_long", int, REQUIRED),
+    "IsHighlight": ("is_highlight", bool, True),
+    "IsRecord": ("is_record", bool, False),
+    "RecordMode": ("record_mode", str, "full"),
+    "RecordSource": ("record_source", str, "screen"),
+    "RecordBufferSeconds": ("record_buffer_seconds", int, 30),
+    "RecordBufferMB": ("record_buffer_mb", int, 256),
+    "RecordSegmentSeconds": ("record_segment_seconds", int, 300),
+    "RecordSegmentMB": ("record_segment_mb", int, 100),
+    "RecordKeepSegments": ("record_keep_segments", int, 48),
+    "ExistDelay": ("exist_delay", int, 500),
+    "StableMs": ("stable_ms", int, 150),
+    "NetworkIdleMs": ("network_idle_ms", int, 300),
+    "BreakerThreshold": ("breaker_threshold", int, 3),
+    "BreakerProbeInterval": ("breaker_probe_interval", int, 30),
+    "ConfigPollInterval": ("config_poll_interval", int, 5),
+    "ArtifactRetention": ("artifact_retention", int, 200),
+    "DriverPath": ("driver_path", str, ""),
+    "DriverOffline": ("driver_offline", bool, False),
+    "BrowserProfile": ("browser_profile", str, "default"),
+    "Browser": ("browser", str, ""),
+    "BrowserVersion": ("browser_version", str, ""),
+    "BlockedUrls": ("blocked_urls", str, ""),
+    "BlockedResourceTypes": ("blocked_resource_types", str, ""),
+    "ReportRequests": ("report_requests", bool, False),
+    "LogLevel": ("log_level", str, "INFO"),
+    "TraceCommands": ("trace_commands", bool, False),
+}
+
+# Fields that must be strictly positive; every other int must not be negative
+POSITIVE_FIELDS = {
+    "timeout_short", "timeout_medium", "timeout_long",
+    "breaker_threshold", "breaker_probe_interval", "config_poll_interval", "artifact_retention", "record_buffer_seconds",
+    "record_buffer_mb", "record_segment_seconds", "record_segment_mb",
+}
+
+# Allowed values of the string fields
+CHOICES = {
+    "record_mode": ("full", "failure"),
+    "record_source": ("screen", "browser"),
+    "browser_profile": tuple(PROFILES),
+    "browser": ("", "chrome", "firefox", "edge"),
+    "log_level": ("DEBUG", "INFO", "WARNING", "ERROR"),
+}
+
+# Allowed items of the comma-separated string fields
+LIST_CHOICES = {
+    "blocked_resource_types": tuple(RESOURCE_TYPE_PATTERNS),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Credentials:
+    username: str
+    password: str = field(repr=False)
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    version: int
+    login_credentials: Credentials = field(repr=False)
+    timeout_short: int  # seconds
+    timeout_medium: int
+    timeout_long: int
+    delay_short: int  # milliseconds
+    delay_medium: int
+    delay_long: int
+    is_highlight: bool
+    is_record: bool
+    record_mode: str  # "full" video of the run, or "failure" clips only
+    record_source: str  # "screen" (mss, needs a desktop) or "browser" (each bot's viewport, works headless)
+    record_buffer_seconds: int  # seconds kept before a failure in "failure" mode
+    record_buffer_mb: int  # memory for those seconds, fewer are kept when the screen changes a lot
+    record_segment_seconds: int  # video seconds per segment in "full" mode
+    record_segment_mb: int  # maximum segment size in "full" mode
+    record_keep_segments: int  # segments kept across runs, 0 keeps all
+    exist_delay: int  # milliseconds to settle before checking an element exists
+    stable_ms: int  # milliseconds an element must stay unchanged to count as stable
+    network_idle_ms: int  # milliseconds without fetch/XHR in flight to count as network idle
+    breaker_threshold: int
+    breaker_probe_interval: int  # seconds
+    config_poll_interval: int  # seconds
+    artifact_retention: int  # failure screenshots and page sources kept
+    driver_path: str  # explicit WebDriver binary; empty uses the driver cache
+    driver_offline: bool  # never download drivers, only use the cache
+    browser_profile: str  # launch profile name from reusables.browser_profiles
+    browser: str  # pinned browser, empty detects the installed one
+    browser_version: str  # pinned version of the pinned browser, empty reads it (cached)
+    blocked_urls: str  # comma-separated URL patterns with * wildcards the browsers never load
+    blocked_resource_types: str  # comma-separated: image, font, stylesheet, media, script
+    report_requests: bool  # print request counts per item even if nothing is blocked
+    log_level: str  # level of the JSON log file, DEBUG also logs FindParallel lookups
+    trace_commands: bool  # time every WebDriver command and report them per item
+
+    @classmethod
+    def from_variables(cls, version, dict_int, dict_string, dict_bool, credentials):
+        """
+        Validate the parsed sheets and build the config.
+        :raises ConfigError: listing every problem found, not just the first one
+        """
+        problems = []
+        declared = {**dict_int, **dict_string, **dict_bool}
+        values = {}
+
+        for variable_name, (field_name, field_type, default) in SCHEMA.items():
+            # An empty cell reads as NaN (pandas) and counts as not set
+            if variable_name not in declared or _is_blank(declared[variable_name]["value"]):
+                if default is REQUIRED:
+                    problems.append(f"{variable_name} is missing")
+                values[field_name] = default
+                continue
+            try:
+                values[field_name] = _coerce(declared[variable_name]["value"], field_type)
+            except (TypeError, ValueError):
+                problems.append(
+                    f"{variable_name} must be {field_type.__name__}, got {declared[variable_name]['value']!r}"
+                )
+                continue
+            if field_type is int:
+                if field_name in POSITIVE_FIELDS and values[field_name] <= 0:
+                    problems.append(f"{variable_name} must be greater than 0")
+                elif values[field_name] < 0:
+                    problems.append(f"{variable_name} must not be negative")
+            elif field_name in CHOICES and values[field_name] not in CHOICES[field_name]:
+                problems.append(f"{variable_name} must be one of {', '.join(CHOICES[field_name])}")
+            elif field_name in LIST_CHOICES:
+                unknown_items = set(_split_list(values[field_name])) - set(LIST_CHOICES[field_name])
+                if unknown_items:
+                    problems.append(
+                        f"{variable_name} has unknown value(s) {', '.join(sorted(unknown_items))}, "
+                        f"choose from {', '.join(LIST_CHOICES[field_name])}"
+                    )
+
+        login = credentials.get("login_credentials") or {}
+        if not login.get("username") or not login.get("password"):
+            problems.append("Cred sheet needs login_credentials with a username and a password")
+
+        if problems:
+            raise ConfigError(problems)
+
+        unknown = declared.keys() - SCHEMA.keys()
+        if unknown:
+            print(f"Ignoring unknown config variable(s): {', '.join(sorted(unknown))}")
+
+        return cls(
+            version=version,
+            login_credentials=Credentials(login["username"], login["password"]),
+            **values,
+        )
+
+    @property
+    def blocked_url_list(self):
+        return _split_list(self.blocked_urls)
+
+    @property
+    def blocked_resource_type_list(self):
+        return _split_list(self.blocked_resource_types)
+
+    def changed_fields(self, previous):
+        """Names of the fields whose value differs from ``previous``."""
+        return {
+            f.name for f in fields(self)
+            if f.name != "version" and (previous is None or getattr(self, f.name) != getattr(previous, f.name))
+        }
+
+
+def _split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def _is_blank(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _coerce(value, field_type):
+    if field_type is bool:
+        if isinstance(value, str):
+            if value.strip().lower() in ("true", "1", "yes"):
+                return True
+            if value.strip().lower() in ("false", "0", "no"):
+                return False
+            raise ValueError(value)
+        return bool(value)
+    if field_type is int:
+        if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+            raise ValueError(value)
+        return int(value)
+    return str(value)
+
+
+def apply_config(config):
+    """Push the timing, highlight and log-level settings into the constants, Action and logging."""
+    from library.action import Action
+    from reusables import logging_config
+
+    configure_timing(
+        timeouts={"SHORT": config.timeout_short, "MEDIUM": config.timeout_medium, "LONG": config.timeout_long},
+        delays={"SHORT": config.delay_short, "MEDIUM": config.delay_medium, "LONG": config.delay_long},
+    )
+    Action.DEBUG_MODE = config.is_highlight
+    Action.EXIST_DELAY = config.exist_delay
+    Action.STABLE_MS = config.stable_ms
+    Action.NETWORK_IDLE_MS = config.network_idle_ms
+    logging_config.set_level(config.log_level)
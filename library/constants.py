@@ -1,6 +1,4 @@
-from asyncio import timeout
 from enum import Enum
-import pandas as pd
 
 
 # using in initialization app
@@ -37,6 +35,11 @@ class Timeout(Enum):
     MEDIUM = 10
     LONG = 30
 
+    @property
+    def seconds(self):
+        """Timeout from Config.xlsx (TimeOutS/M/L), or the default value before it is loaded."""
+        return _timeout_seconds.get(self.name, self.value)
+
 
 
 # class Delay(Enum):
@@ -48,9 +51,25 @@ class Timeout(Enum):
 
 
 class Delay(Enum):
-    SHORT = 5  # seconds
-    MEDIUM = 10
-    LONG = 30
+    SHORT = 100  # milliseconds, long enough for a redraw
+    MEDIUM = 200
+    LONG = 300
+
+    @property
+    def milliseconds(self):
+        """Delay from Config.xlsx (DelayS/M/L), or the default value before it is loaded."""
+        return _delay_milliseconds.get(self.name, self.value)
+
+
+# Filled from the typed config by library.config.apply_config
+_timeout_seconds = {}
+_delay_milliseconds = {}
+
+
+def configure_timing(timeouts, delays):
+    """Set the Timeout/Delay values by member name, e.g. {"SHORT": 10}."""
+    _timeout_seconds.update(timeouts)
+    _delay_milliseconds.update(delays)
 
 class ClickType(Enum):
 
@@ -63,5 +82,8 @@ class ClickButton(Enum):
     RIGHT = "right"
 
 
-
-
+class Readiness(Enum):
+    """What IsExist waits for in the page before it looks up the element."""
+    NONE = "none"  # fixed ExistDelay sleep
+    NETWORK_IDLE = "network_idle"  # document parsed and no fetch/XHR in flight for NetworkIdleMs
+    ELEMENT_STABLE = "element_stable"  # element present and unchanged for StableMs
@@ -0,0 +1,122 @@
+"""
+Page-readiness checks that run inside the browser.
+
+Each check is one asynchronous script that resolves as soon as the condition holds
+(or its own timeout passes), so waiting costs a single WebDriver round trip instead
+of a fixed sleep or a polling loop over the wire.
+
+- Network idle: the document is parsed and no fetch/XHR is in flight for ``idle_ms``. The counters are injected
+  before any page script on Chromium browsers (DevTools), and into the current
+  document elsewhere, where they only see requests started after the injection.
+- Element stable: the element exists and neither its subtree nor its value/text
+  changed for ``quiet_ms``.
+
+A script started just before a navigation dies with the old document ("document
+unloaded while waiting for result"); it is run once more in the new document.
+"""
+
+from selenium.common.exceptions import JavascriptException
+
+NETWORK_TRACKER_JS = """
+(function () {
+    if (window.__rpaNetwork) { return; }
+    var state = window.__rpaNetwork = {pending: 0, last: performance.now()};
+    function start() { state.pending += 1; state.last = performance.now(); }
+    function done() { state.pending = Math.max(0, state.pending - 1); state.last = performance.now(); }
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            start();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        start();
+        this.addEventListener("loadend", done);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+NETWORK_IDLE_JS = NETWORK_TRACKER_JS + """
+var idleMs = arguments[0], timeoutMs = arguments[1], callback = arguments[arguments.length - 1];
+var started = performance.now(), state = window.__rpaNetwork;
+(function check() {
+    var now = performance.now();
+    if (document.readyState !== "loading" && state.pending === 0 && now - state.last >= idleMs) {
+        callback(true); return;
+    }
+    if (now - started > timeoutMs) { callback(false); return; }
+    setTimeout(check, 25);
+})();
+"""
+
+ELEMENT_STABLE_JS = """
+var xpath = arguments[0], quietMs = arguments[1], timeoutMs = arguments[2];
+var callback = arguments[arguments.length - 1];
+var started = performance.now(), element = null, observer = null, lastChange = 0, snapshot = null;
+function find() {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function read(node) { return node.value !== undefined ? String(node.value) : node.textContent; }
+function finish(result) { if (observer) { observer.disconnect(); } callback(result); }
+(function check() {
+    var now = performance.now();
+    var current = find();
+    if (current !== element) {
+        // (Re)attach when the element appears or is replaced
+        if (observer) { observer.disconnect(); observer = null; }
+        element = current;
+        lastChange = now;
+        if (element) {
+            snapshot = read(element);
+            observer = new MutationObserver(function () { lastChange = performance.now(); });
+            observer.observe(element, {attributes: true, childList: true, subtree: true, characterData: true});
+        }
+    } else if (element) {
+        var value = read(element);
+        if (value !== snapshot) { snapshot = value; lastChange = now; }
+        if (now - lastChange >= quietMs) { finish(true); return; }
+    }
+    if (now - started > timeoutMs) { finish(false); return; }
+    setTimeout(check, 25);
+})();
+"""
+
+
+def _prepare(driver, timeout_s):
+    """Make sure the driver lets an async script run for ``timeout_s`` and tracks the network early."""
+    needed = timeout_s + 5
+    if getattr(driver, "_readiness_script_timeout", 0) < needed:
+        driver.set_script_timeout(needed)
+        driver._readiness_script_timeout = needed
+    if not getattr(driver, "_readiness_tracker_installed", False):
+        driver._readiness_tracker_installed = True
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_JS})
+            except Exception as e:
+                print(f"Network tracker falls back to per-page injection: {e}")
+
+
+def _run(driver, script, *args):
+    """Run an async check, once more if a navigation unloaded the document it started in."""
+    try:
+        return bool(driver.execute_async_script(script, *args))
+    except JavascriptException as e:
+        if "document unloaded" not in str(e):
+            raise
+        return bool(driver.execute_async_script(script, *args))
+
+
+def wait_for_network_idle(driver, idle_ms, timeout_s):
+    _prepare(driver, timeout_s)
+    return _run(driver, NETWORK_IDLE_JS, idle_ms, timeout_s * 1000)
+
+
+def wait_for_element_stable(driver, xpath, quiet_ms, timeout_s):
+    _prepare(driver, timeout_s)
+    return _run(driver, ELEMENT_STABLE_JS, xpath, quiet_ms, timeout_s * 1000)
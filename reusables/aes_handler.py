@@ -1,12 +1,18 @@
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import padding
+import io
+import mmap
 import os
 import base64
+import tempfile
+import time
 
 # AES key size should be 16, 24, or 32 bytes (128, 192, 256 bits respectively)
 KEY_SIZE = 32  # For AES-256
 BLOCK_SIZE = 16  # AES block size in bytes
+CHUNK_SIZE = 1024 * 1024  # Bytes processed per step when streaming
+STREAM_MAGIC = b"AESS1"  # Header of streamed files, followed by the per-file IV
 
 
 class AESHandler:
@@ -17,6 +23,8 @@ class AESHandler:
         """
         self.key = key if key else self.generate_key(KEY_SIZE)
         self.iv = iv if iv else self.generate_iv()
+        # Built once; every call only creates a cheap encryptor/decryptor from it
+        self._cipher = Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend())
         # print("key", self.key)
         # print("iv", self.iv)
 
@@ -39,11 +47,8 @@ class AESHandler:
         padder = padding.PKCS7(algorithms.AES.block_size).padder()
         padded_data = padder.update(plaintext) + padder.finalize()
 
-        # Create AES cipher and encrypt
-        cipher = Cipher(
-            algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
+        # Encrypt with the shared AES cipher
+        encryptor = self._cipher.encryptor()
         ciphertext = encryptor.update(padded_data) + encryptor.finalize()
 
         # Encode ciphertext as Base64
@@ -58,11 +63,8 @@ class AESHandler:
             # Decode Base64 ciphertext
             ciphertext_bytes = base64.b64decode(ciphertext)
 
-            # Create AES cipher and decrypt
-            cipher = Cipher(
-                algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend()
-            )
-            decryptor = cipher.decryptor()
+            # Decrypt with the shared AES cipher
+            decryptor = self._cipher.decryptor()
             padded_plaintext = decryptor.update(ciphertext_bytes) + decryptor.finalize()
 
             # Unpad the plaintext
@@ -72,5 +74,130 @@ class AESHandler:
         except Exception as e:
             raise ValueError(f"Decryption failed: {e}")
 
+    def _stream_cipher(self, iv):
+        """Cipher for one stream; every stream gets its own IV."""
+        return Cipher(algorithms.AES(self.key), modes.CBC(iv), backend=default_backend())
+
+    @staticmethod
+    def _iter_chunks(source, chunk_size):
+        """
+        Yield the rest of ``source`` in chunks of at most ``chunk_size`` bytes.
+        Regular files are memory-mapped instead of read, other streams are read.
+        """
+        try:
+            fileno = source.fileno()
+            size = os.fstat(fileno).st_size
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            size = 0
+
+        if size:
+            start = source.tell()
+            with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+                for offset in range(start, size, chunk_size):
+                    yield mapped[offset:offset + chunk_size]
+            source.seek(size)
+            return
+
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def encrypt_stream(self, source, destination, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Encrypts a binary stream chunk by chunk using AES-CBC with a random IV.
+        Memory use is bounded by ``chunk_size`` whatever the stream length.
+        Returns the number of plaintext bytes read.
+        """
+        iv = self.generate_iv()
+        encryptor = self._stream_cipher(iv).encryptor()
+        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+
+        destination.write(STREAM_MAGIC + iv)
+        total = 0
+        for chunk in self._iter_chunks(source, chunk_size):
+            destination.write(encryptor.update(padder.update(chunk)))
+            total += len(chunk)
+        destination.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+        return total
+
+    def decrypt_stream(self, source, destination, chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Decrypts a stream written by ``encrypt_stream`` chunk by chunk.
+        Returns the number of plaintext bytes written.
+        """
+        header = source.read(len(STREAM_MAGIC) + BLOCK_SIZE)
+        if len(header) != len(STREAM_MAGIC) + BLOCK_SIZE or not header.startswith(STREAM_MAGIC):
+            raise ValueError("Decryption failed: not an encrypted stream")
+        decryptor = self._stream_cipher(header[len(STREAM_MAGIC):]).decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+
+        total = 0
+        try:
+            for chunk in self._iter_chunks(source, chunk_size):
+                plaintext = unpadder.update(decryptor.update(chunk))
+                destination.write(plaintext)
+                total += len(plaintext)
+            plaintext = unpadder.update(decryptor.finalize()) + unpadder.finalize()
+        except ValueError as e:
+            raise ValueError(f"Decryption failed: {e}")
+        destination.write(plaintext)
+        return total + len(plaintext)
+
+    def encrypt_file(self, input_path: str, output_path: str = None, chunk_size: int = CHUNK_SIZE) -> str:
+        """Encrypts a file to ``output_path`` (default: ``<input>.enc``) and returns the path."""
+        output_path = output_path or input_path + ".enc"
+        with open(input_path, "rb") as source:
+            self._write_atomically(output_path, lambda destination: self.encrypt_stream(source, destination, chunk_size))
+        return output_path
+
+    def decrypt_file(self, input_path: str, output_path: str = None, chunk_size: int = CHUNK_SIZE) -> str:
+        """Decrypts a file written by ``encrypt_file`` and returns the output path."""
+        if not output_path:
+            output_path = input_path[:-len(".enc")] if input_path.endswith(".enc") else input_path + ".dec"
+        with open(input_path, "rb") as source:
+            self._write_atomically(output_path, lambda destination: self.decrypt_stream(source, destination, chunk_size))
+        return output_path
+
+    @staticmethod
+    def _write_atomically(output_path, write):
+        """Write through a temporary file so a failed run never leaves a truncated output."""
+        directory = os.path.dirname(output_path) or "."
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as destination:
+                write(destination)
+            os.replace(temp_path, output_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+
+def benchmark(size_mb: int = 256, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Measure streaming throughput on a temporary file of ``size_mb`` MB.
+    Returns the encrypt and decrypt speed in MB/s.
+    """
+    aes = AESHandler()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        plain_path = os.path.join(directory, "plain.bin")
+        with open(plain_path, "wb") as file:
+            block = os.urandom(CHUNK_SIZE)
+            for _ in range(size_mb):
+                file.write(block)
+
+        started = time.perf_counter()
+        encrypted_path = aes.encrypt_file(plain_path, chunk_size=chunk_size)
+        results["encrypt_mb_s"] = size_mb / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        aes.decrypt_file(encrypted_path, os.path.join(directory, "decrypted.bin"), chunk_size=chunk_size)
+        results["decrypt_mb_s"] = size_mb / (time.perf_counter() - started)
+    return results
 
 
+if __name__ == "__main__":
+    speeds = benchmark()
+    print(f"encrypt: {speeds['encrypt_mb_s']:.1f} MB/s, decrypt: {speeds['decrypt_mb_s']:.1f} MB/s")
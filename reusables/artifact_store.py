@@ -0,0 +1,212 @@
+"""
+Failure artifact store.
+
+A failing sub-process hands its screenshot and page source to ``artifact_store``,
+which only grabs the bytes from the driver on the bot's thread. Compressing and
+writing happen on a background thread. Artifacts are named after the bot, item and
+state they belong to, identical screenshots are stored once by content hash, and
+only the newest ``max_artifacts`` failures are kept. ``manifest.jsonl`` lists what
+is kept.
+
+Several bot processes can share the directory: each write re-reads the manifest and
+appends or prunes it under a lock file, so no process drops another's records or
+deletes an image another one still lists.
+"""
+
+import contextlib
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+from datetime import datetime, timezone
+
+from reusables.tracer import current_state
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_DIR = "../Screenshots"
+
+
+class ArtifactStore:
+    def __init__(self, directory=ARTIFACT_DIR, max_artifacts=200):
+        """
+        :param directory: where the manifest, page sources and the images/ folder go
+        :param max_artifacts: failures kept; older ones and images nobody uses any more are deleted
+        """
+        self.directory = directory
+        self.max_artifacts = max_artifacts
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    def capture(self, driver, name, error=None):
+        """
+        Save the screenshot and page source of ``driver`` for the failure ``name``
+        (e.g. the sub-process function name). Never raises: losing an artifact must
+        not replace the error being handled.
+        """
+        try:
+            screenshot = driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.warning("Could not take a screenshot for %s: %s", name, e)
+            screenshot = None
+        try:
+            page_source = driver.page_source
+            url = driver.current_url
+        except Exception:
+            page_source, url = None, None
+
+        self._queue.put({
+            "time": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "name": name,
+            "error": f"{error.__class__.__name__}: {error}" if error else None,
+            "url": url,
+            **current_state(),
+            "_screenshot": screenshot,
+            "_page_source": page_source,
+        })
+        self._ensure_writer()
+
+    def flush(self):
+        """Block until every captured artifact is written."""
+        self._queue.join()
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="artifact-writer", daemon=True)
+                self._thread.start()
+
+    def _write_loop(self):
+        while True:
+            artifact = self._queue.get()
+            try:
+                self._write(artifact)
+            except Exception as e:
+                logger.error("Could not save failure artifact %s: %s", artifact["name"], e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, artifact):
+        images = os.path.join(self.directory, "images")
+        os.makedirs(images, exist_ok=True)
+
+        screenshot = artifact.pop("_screenshot")
+        page_source = artifact.pop("_page_source")
+        stem = "_".join(
+            _safe(part) for part in (
+                artifact["time"][:23].replace(":", "-"),
+                f"{os.getpid()}.{next(self._sequence)}",  # Unique even within one millisecond
+                f"bot{artifact.get('bot_id')}",
+                artifact.get("item_id") or "noitem",
+                artifact.get("state") or "nostate",
+                artifact["name"],
+            )
+        )
+
+        if page_source is not None:
+            artifact["page_source"] = f"{stem}.html.gz"
+            _write_atomically(
+                os.path.join(self.directory, artifact["page_source"]),
+                gzip.compress(page_source.encode("utf-8"), compresslevel=6),
+            )
+
+        with _file_lock(os.path.join(self.directory, "manifest.lock")):
+            if screenshot is not None:
+                # Identical screens (the same error page over and over) are stored once; under
+                # the lock, so another process cannot prune the image before it is listed
+                digest = hashlib.sha256(screenshot).hexdigest()
+                artifact["image"] = f"images/{digest}.png"
+                image_path = os.path.join(self.directory, artifact["image"])
+                if not os.path.exists(image_path):
+                    _write_atomically(image_path, screenshot)
+
+            records = self._load_manifest()
+            records.append(artifact)
+            if len(records) > self.max_artifacts:
+                self._save_manifest(self._prune(records))
+            else:
+                with open(self._manifest_path(), "a", encoding="utf-8") as file:
+                    file.write(json.dumps(artifact, default=str) + "\n")
+
+    def _prune(self, records):
+        """Delete the files only the oldest records used; returns the records kept."""
+        removed = records[:-self.max_artifacts]
+        records = records[-self.max_artifacts:]
+        images_in_use = {record.get("image") for record in records}
+        for record in removed:
+            for key in ("page_source", "image"):
+                path = record.get(key)
+                if not path or (key == "image" and path in images_in_use):
+                    continue
+                try:
+                    os.remove(os.path.join(self.directory, path))
+                except FileNotFoundError:
+                    pass
+                images_in_use.add(path)  # Already gone, another removed record may share the image
+        return records
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, "manifest.jsonl")
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path(), encoding="utf-8") as file:
+                return [json.loads(line) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _save_manifest(self, records):
+        _write_atomically(
+            self._manifest_path(),
+            "".join(json.dumps(record, default=str) + "\n" for record in records).encode("utf-8"),
+        )
+
+
+def _safe(part):
+    return "".join(c if c.isalnum() or c in "-." else "-" for c in str(part))
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Hold an exclusive lock on ``path`` against other processes (and other writers)."""
+    with open(path, "a+b") as file:
+        if os.name == "nt":
+            import msvcrt
+
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)  # Retries for about 10 seconds
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+
+def _write_atomically(path, data):
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+
+artifact_store = ArtifactStore()
@@ -1,50 +1,78 @@
-import subprocess
+import json
+import logging
+import os
 import platform
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+DETECTION_CACHE_PATH = "../data/browser_detection.json"
+
+# Browsers in order of preference, with the command that reports their version
+BROWSER_COMMANDS = {
+    "chrome": "chrome",
+    "firefox": "firefox",
+    "edge": "msedge",
+    "safari": "safari",
+    "opera": "opera",
+}
+
+# Results of this process, so every bot and pipeline lane after the first pays nothing
+_detected = {}
+_detected_lock = threading.Lock()
 
 
 class BrowserDetection:
     """
     detect installed browsers and return the version
+
+    All browsers are probed at once, and each version is cached on disk keyed by the
+    executable path and its mtime, so a probe only spawns a process after the browser
+    was installed or updated. A pinned browser (and version) skips detection.
     """
 
-    def __init__(self):
-        pass
+    def __init__(self, pinned_browser=None, pinned_version=None, cache_path=DETECTION_CACHE_PATH):
+        self.pinned_browser = pinned_browser or None
+        self.pinned_version = pinned_version or None
+        self.cache_path = cache_path
 
     def _get_os(self):
         return platform.system().lower()
 
-    def _get_browser_version(self, os_name, browser_name):
-        if os_name == "windows":
-            return self._get_browser_version_windows(browser_name)
-        elif os_name == "darwin":  # macOS
-            return self._get_browser_version_macos(browser_name)
-        elif os_name == "linux":
-            return self._get_browser_version_linux(browser_name)
-        else:
-            print(f"Unsupported operating system: {os_name}")
+    def _get_browser_version(self, os_name, browser_name, cache):
+        executable = self._find_executable(os_name, browser_name)
+        if not executable:
             return None
 
-    def _run_command(self, command):
-        result = subprocess.run(command, capture_output=True, text=True, shell=True)
-        if result.returncode == 0 and result.stdout:
-            return result.stdout.strip().split()[-1]
-        return None
-
-    def _check_browser_in_path(self, browser_name):
-        commands = {
-            "chrome": "chrome --version",
-            "firefox": "firefox --version",
-            "edge": "msedge --version",
-            "safari": "safari --version",
-            "opera": "opera --version"
-        }
-        return self._run_command(commands.get(browser_name))
+        try:
+            mtime_ns = os.stat(executable).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cached = cache.get(browser_name)
+        if cached and cached["path"] == executable and cached["mtime_ns"] == mtime_ns:
+            return cached["version"]
+
+        if os_name == "windows" and not executable.lower().endswith(".exe"):
+            version = None
+        elif os_name == "windows":
+            version = self._run_command(
+                ["powershell", "-NoProfile", "-Command", f"(Get-Item -Path '{executable}').VersionInfo.ProductVersion"]
+            )
+        else:
+            version = self._run_command([executable, "--version"])
 
-    def _get_browser_version_windows(self, browser_name):
-        # First, try using the PATH
-        version = self._check_browser_in_path(browser_name)
         if version:
-            return version
+            cache[browser_name] = {"path": executable, "mtime_ns": mtime_ns, "version": version}
+        return version
+
+    def _find_executable(self, os_name, browser_name):
+        """Locate the browser without spawning anything: the PATH, then the registry on Windows."""
+        executable = shutil.which(BROWSER_COMMANDS[browser_name])
+        if executable or os_name != "windows":
+            return executable
 
         # Try to find the browser in the registry
         import winreg
@@ -58,25 +86,38 @@ class BrowserDetection:
 
         try:
             key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, registry_paths[browser_name])
-            executable_path = winreg.QueryValue(key, None)
-            version = self._run_command(
-                f'powershell -Command "(Get-Item -Path \'{executable_path}\').VersionInfo.ProductVersion"')
-            return version
+            return winreg.QueryValue(key, None)
         except FileNotFoundError:
-            print(f"{browser_name} not found in registry.")
+            return None
         except Exception as e:
-            print(f"Error accessing registry for {browser_name}: {e}")
+            logger.warning("Error accessing registry for %s: %s", browser_name, e)
+            return None
 
-        print(f"{browser_name} is not installed.")
+    def _run_command(self, command):
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, timeout=15)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if result.returncode == 0 and result.stdout:
+            return result.stdout.strip().split()[-1]
         return None
 
-    def _get_browser_version_macos(self, browser_name):
-        # Check in PATH as before
-        return self._check_browser_in_path(browser_name)
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
 
-    def _get_browser_version_linux(self, browser_name):
-        # Check in PATH as before
-        return self._check_browser_in_path(browser_name)
+    def _save_cache(self, cache):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(cache, file, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not save the browser detection cache: %s", e)
 
     def get_os_browser_version(self):
         """
@@ -84,13 +125,37 @@ class BrowserDetection:
         :return: operating system name, browser name, browser version
         """
         os_name = self._get_os()
-        browser_list = ["chrome", "firefox", "edge", "safari","opera"]
-        for browser in browser_list:
-            browser_version = self._get_browser_version(os_name, browser)
+        if self.pinned_browser and self.pinned_version:
+            return os_name, self.pinned_browser, self.pinned_version
+
+        key = (self.pinned_browser, self.cache_path)
+        with _detected_lock:
+            if key not in _detected:
+                _detected[key] = self._detect(os_name)
+            browser, browser_version = _detected[key]
+        if browser_version:
+            logger.info("the %s version: %s", browser, browser_version)
+        return os_name, browser, browser_version
+
+    def _detect(self, os_name):
+        browser_list = [self.pinned_browser] if self.pinned_browser else list(BROWSER_COMMANDS)
+        cache = self._load_cache()
+        before = json.dumps(cache, sort_keys=True)
+
+        with ThreadPoolExecutor(max_workers=len(browser_list), thread_name_prefix="browser-probe") as pool:
+            versions = list(pool.map(lambda browser: self._get_browser_version(os_name, browser, cache), browser_list))
+
+        if json.dumps(cache, sort_keys=True) != before:
+            self._save_cache(cache)
+        for browser, browser_version in zip(browser_list, versions):
             if browser_version:
-                print(f"the {browser} version: {browser_version}")
-                return os_name, browser, browser_version
-        return os_name, None, None
+                return browser, browser_version
+        if self.pinned_browser:
+            logger.warning("%s is pinned in the config but its version could not be read.", self.pinned_browser)
+            return self.pinned_browser, None
+        return None, None
+
+
 # def get_os():
 #     return platform.system()
 # def get_browser_version(os_name, browser_name):
@@ -159,7 +224,7 @@ class BrowserDetection:
 #     for browser in browser_list:
 #         browser_version = get_browser_version(os_name, browser)
 #         if browser_version:
-#             print(f"the {browser} version: {browser_version}")
+#             logger.info("the %s version: %s", browser, browser_version)
 #             return os_name, browser, browser_version
 #     return os_name, None, None
 
@@ -0,0 +1,72 @@
+"""
+Named browser launch profiles.
+
+A profile bundles the launch settings a run needs, so Config.xlsx only names one
+(BrowserProfile) and WebDriver translates it for Chrome, Edge and Firefox.
+"""
+
+from dataclasses import dataclass
+
+
+def _extension_patterns(*extensions):
+    return tuple(pattern for extension in extensions for pattern in (f"*.{extension}", f"*.{extension}?*"))
+
+
+# URL patterns per resource type, for request blocking; a font-blocking profile uses "font"
+RESOURCE_TYPE_PATTERNS = {
+    "image": _extension_patterns("png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "bmp"),
+    "font": _extension_patterns("woff", "woff2", "ttf", "otf", "eot") + ("*fonts.googleapis.com*", "*fonts.gstatic.com*"),
+    "stylesheet": _extension_patterns("css"),
+    "media": _extension_patterns("mp4", "webm", "mp3", "ogg", "wav"),
+    "script": _extension_patterns("js"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class BrowserProfile:
+    name: str
+    headless: bool = False
+    page_load_strategy: str = "normal"  # "normal" waits for load, "eager" for DOMContentLoaded
+    block_images: bool = False
+    block_fonts: bool = False
+    disable_background_throttling: bool = False
+    disable_extensions: bool = False
+    window_size: tuple = None  # (width, height), None keeps the browser default
+    disk_cache_dir: str = None  # shared across runs; each bot gets its own sub-folder
+
+
+PROFILES = {
+    # A normal headed browser, useful to watch or debug a run; pages return at DOMContentLoaded
+    # because the page objects wait for the elements they need to be stable (library.readiness)
+    "default": BrowserProfile("default", page_load_strategy="eager"),
+    # Unattended production runs: nothing on screen, nothing downloaded that the bot never reads
+    "production": BrowserProfile(
+        "production",
+        headless=True,
+        page_load_strategy="eager",
+        block_images=True,
+        block_fonts=True,
+        disable_background_throttling=True,
+        disable_extensions=True,
+        window_size=(1366, 768),
+        disk_cache_dir="../browser-cache",
+    ),
+    # Production settings with a visible window, to check the profile itself
+    "production-headed": BrowserProfile(
+        "production-headed",
+        page_load_strategy="eager",
+        block_images=True,
+        block_fonts=True,
+        disable_background_throttling=True,
+        disable_extensions=True,
+        window_size=(1366, 768),
+        disk_cache_dir="../browser-cache",
+    ),
+}
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile {name!r}, choose from {', '.join(PROFILES)}")
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Pages the bot depends on; the site is considered down when any of them is unreachable
+PROBE_URLS = (
+    "https://acme-test.uipath.com/login",
+    "https://emn178.github.io/online-tools/sha1.html",
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker around the target sites, shared by every bot in the process.
+
+    A failed item is checked with a cheap HTTP probe. If the sites are unreachable the
+    failure counts as an infrastructure failure (the item keeps its retry budget), and
+    after ``failure_threshold`` consecutive ones the breaker opens: claiming pauses and
+    the sites are probed every ``probe_interval`` seconds until they answer again.
+
+    Bots that fail together share one probe: its result is reused for ``probe_reuse``
+    seconds, and a bot that fails while a probe is running waits for that one.
+    """
+
+    def __init__(self, failure_threshold=3, probe_interval=30, probe_timeout=10, probe_urls=PROBE_URLS,
+                 probe_reuse=10):
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.probe_urls = probe_urls
+        self.probe_reuse = probe_reuse
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._last_probe = (float("-inf"), True)  # (monotonic time, result)
+
+    def configure(self, failure_threshold=None, probe_interval=None):
+        """Override the limits, e.g. from the Config.xlsx constants."""
+        if failure_threshold:
+            self.failure_threshold = int(failure_threshold)
+        if probe_interval:
+            self.probe_interval = int(probe_interval)
+
+    def probe(self) -> bool:
+        """Return True if every target page answers without a server error."""
+        import urllib.error
+        import urllib.request
+
+        for url in self.probe_urls:
+            try:
+                request = urllib.request.Request(url, method="HEAD")
+                with urllib.request.urlopen(request, timeout=self.probe_timeout) as response:
+                    if response.status >= 500:
+                        return False
+            except urllib.error.HTTPError as e:
+                if e.code >= 500:
+                    return False
+            except Exception as e:
+                logger.warning("Circuit breaker probe of %s failed: %s", url, e)
+                return False
+        return True
+
+    def recent_probe(self) -> bool:
+        """The result of a probe made in the last ``probe_reuse`` seconds, else of a new one."""
+        with self._probe_lock:
+            probed_at, result = self._last_probe
+            if time.monotonic() - probed_at >= self.probe_reuse:
+                result = self.probe()
+                self._last_probe = (time.monotonic(), result)
+            return result
+
+    def record_success(self):
+        """An item went through, so the sites are healthy."""
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit breaker closed.")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> bool:
+        """
+        Classify a failed item by probing the sites.
+        :return: True if it was an infrastructure failure (sites down)
+        """
+        if self.recent_probe():
+            # The sites answer, so the item itself failed; earlier infrastructure failures are over
+            with self._lock:
+                self.consecutive_failures = 0
+            return False
+
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning("Circuit breaker opened after %s infrastructure failure(s).", self.consecutive_failures)
+                self.state = OPEN
+        return True
+
+    def wait_until_closed(self, context):
+        """Block before claiming an item while the breaker is open, probing periodically."""
+        while self.state == OPEN and not context.terminate:
+            logger.info("Circuit breaker open, probing again in %ss.", self.probe_interval)
+            time.sleep(self.probe_interval)
+            if self.recent_probe():
+                with self._lock:
+                    if self.state == OPEN:
+                        logger.info("Target sites reachable again, circuit breaker half open.")
+                        self.state = HALF_OPEN
+
+
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,165 @@
+"""
+WebDriver command tracing.
+
+Every Action call costs one or more WebDriver HTTP round trips. ``CommandTracer``
+wraps a driver's command executor and times each command, attributed to the page
+object (or state/sub-process) and the Action method that issued it, read from the
+call stack only while tracing is on. ``report_commands`` logs, per item, how many
+commands were sent, the total wire time, the busiest callers and the slowest calls,
+to find chatty code paths, and at DEBUG level the same summary as JSON to compare
+runs and catch regressions.
+
+With span tracing on (``--trace``), each command is also written as a "command" span
+nested under the Action that sent it.
+
+Screenshots taken by a browser recording (reusables.recorder) share the executor;
+they are counted apart, so the item totals only cover what the bot itself sent.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from reusables.tracer import tracer
+
+logger = logging.getLogger(__name__)
+
+SLOWEST = 5
+_ACTION_FILE = os.path.join("library", "action.py")
+# Innermost frame in one of these folders names the caller, e.g. the page object class
+_OWNER_DIRS = tuple(os.sep + name + os.sep for name in ("automation", "sub_process", "state"))
+# Thread names of reusables.recorder, whose commands are not the bot's
+_RECORDER_THREAD_PREFIX = "recorder-"
+
+
+def _caller():
+    """Name the innermost page object (or state) and Action frames as "Owner > Action.method"."""
+    action = owner = None
+    frame = sys._getframe(2)
+    while frame is not None and owner is None:
+        code = frame.f_code
+        if code.co_filename.endswith(_ACTION_FILE):
+            action = action or f"Action.{code.co_name}"
+        elif any(directory in code.co_filename for directory in _OWNER_DIRS):
+            instance = frame.f_locals.get("self")
+            owner = type(instance).__name__ if instance is not None else code.co_name
+        frame = frame.f_back
+    return " > ".join(name for name in (owner, action) if name) or "unknown"
+
+
+class CommandStats:
+    __slots__ = ("commands", "wire_ns", "by_command", "by_caller", "slowest", "recorder_commands", "recorder_ns")
+
+    def __init__(self):
+        self.commands = 0
+        self.wire_ns = 0
+        self.recorder_commands = 0  # sent by a browser recording, not part of the totals
+        self.recorder_ns = 0
+        self.by_command = {}  # command -> [count, ns]
+        self.by_caller = {}  # caller -> [count, ns]
+        self.slowest = []  # min-heap of (ns, seq, command, caller)
+
+    def to_dict(self):
+        def ranked(table):
+            return [
+                {"name": name, "count": count, "ms": round(ns / 1e6, 1)}
+                for name, (count, ns) in sorted(table.items(), key=lambda entry: entry[1][1], reverse=True)
+            ]
+
+        return {
+            "commands": self.commands,
+            "wire_ms": round(self.wire_ns / 1e6, 1),
+            "by_command": ranked(self.by_command),
+            "by_caller": ranked(self.by_caller),
+            "slowest": [
+                {"command": command, "caller": caller, "ms": round(ns / 1e6, 1)}
+                for ns, _, command, caller in sorted(self.slowest, reverse=True)
+            ],
+            "recorder_commands": self.recorder_commands,
+            "recorder_ms": round(self.recorder_ns / 1e6, 1),
+        }
+
+    def __str__(self):
+        lines = [f"{self.commands} commands, {self.wire_ns / 1e6:.0f} ms on the wire"]
+        for caller, (count, ns) in sorted(self.by_caller.items(), key=lambda entry: entry[1][1], reverse=True)[:SLOWEST]:
+            lines.append(f"  {count:4d} x {ns / 1e6:8.1f} ms  {caller}")
+        for ns, _, command, caller in sorted(self.slowest, reverse=True):
+            lines.append(f"  slowest {ns / 1e6:8.1f} ms  {command} from {caller}")
+        if self.recorder_commands:
+            lines.append(f"  recorder {self.recorder_commands} commands, {self.recorder_ns / 1e6:.0f} ms (not counted)")
+        return "\n".join(lines)
+
+
+class CommandTracer:
+    def __init__(self, slowest=SLOWEST):
+        """:param slowest: number of slowest commands kept per report"""
+        self.slowest = slowest
+        self._stats = CommandStats()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def attach(self, driver):
+        """Wrap the driver's command executor; the tracer is reachable as ``driver.command_tracer``."""
+        executor = driver.command_executor
+        execute = executor.execute
+
+        def traced_execute(command, params):
+            if threading.current_thread().name.startswith(_RECORDER_THREAD_PREFIX):
+                return self._timed(execute, command, params, None)
+            caller = _caller()
+            if tracer.enabled:
+                with tracer.span(command, kind="command", caller=caller):
+                    return self._timed(execute, command, params, caller)
+            return self._timed(execute, command, params, caller)
+
+        executor.execute = traced_execute
+        driver.command_tracer = self
+
+    def _timed(self, execute, command, params, caller):
+        started = time.perf_counter_ns()
+        try:
+            return execute(command, params)
+        finally:
+            self._record(command, caller, time.perf_counter_ns() - started)
+
+    def _record(self, command, caller, ns):
+        with self._lock:
+            stats = self._stats
+            if caller is None:  # A browser recording, see traced_execute
+                stats.recorder_commands += 1
+                stats.recorder_ns += ns
+                return
+            stats.commands += 1
+            stats.wire_ns += ns
+            for table, key in ((stats.by_command, command), (stats.by_caller, caller)):
+                entry = table.setdefault(key, [0, 0])
+                entry[0] += 1
+                entry[1] += ns
+            slow = (ns, next(self._sequence), command, caller)
+            if len(stats.slowest) < self.slowest:
+                heapq.heappush(stats.slowest, slow)
+            else:
+                heapq.heappushpop(stats.slowest, slow)
+
+    def collect(self):
+        """Stats since the previous call (per item when called once per item)."""
+        with self._lock:
+            stats, self._stats = self._stats, CommandStats()
+        return stats
+
+
+def report_commands(driver, label):
+    """Log the WebDriver commands of ``driver`` since the last report, if it is traced."""
+    command_tracer = getattr(driver, "command_tracer", None)
+    if command_tracer is None:
+        return None
+    stats = command_tracer.collect()
+    logger.info("WebDriver commands for %s: %s", label, stats)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("WebDriver commands for %s: %s", label, json.dumps(stats.to_dict()))
+    return stats
@@ -0,0 +1,181 @@
+"""
+Compiled snapshot of Config.xlsx.
+
+Parsing the workbook needs pandas and openpyxl, which dominate worker start-up.
+The parsed variables are stored as JSON next to the workbook, keyed by its mtime,
+size and SHA-256, and read back with the standard library until the workbook changes.
+Credentials stay encrypted in the snapshot exactly as they are in the workbook.
+
+The snapshot keeps the variables of each sheet with a fingerprint of that sheet's
+cells, so after an edit only the sheets that changed are parsed again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+VARIABLE_KINDS = ("int", "string", "bool", "credentials")
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+
+def cache_path_for(xlsx_path):
+    return os.path.splitext(xlsx_path)[0] + ".cache.json"
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_builtin(value):
+    """Convert numpy scalars from pandas into plain JSON types."""
+    return value.item() if hasattr(value, "item") else value
+
+
+def _read_snapshot(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return snapshot if snapshot.get("version") == CACHE_VERSION else None
+
+
+def load_cached_config(xlsx_path):
+    """
+    Return the cached (dict_int, dict_string, dict_bool, dict_credentials),
+    or None if there is no snapshot or the workbook changed since it was written.
+    """
+    cache_path = cache_path_for(xlsx_path)
+    snapshot = _read_snapshot(cache_path)
+    try:
+        stat = os.stat(xlsx_path)
+    except OSError:
+        return None
+    if snapshot is None:
+        return None
+    if snapshot["mtime_ns"] != stat.st_mtime_ns or snapshot["size"] != stat.st_size:
+        # Touched but maybe not modified (e.g. checked out again): compare content
+        if snapshot["sha256"] != _file_hash(xlsx_path):
+            return None
+        snapshot["mtime_ns"], snapshot["size"] = stat.st_mtime_ns, stat.st_size
+        _write_snapshot(cache_path, snapshot)
+
+    return merge_sheets({name: sheet["variables"] for name, sheet in snapshot["sheets"].items()})
+
+
+def sheet_fingerprints(xlsx_path):
+    """
+    SHA-256 of the cells of each worksheet, by sheet name, read with the standard library.
+
+    Shared strings are resolved, so a sheet whose text only moved in the workbook's
+    shared string table still compares equal. None if the file cannot be read this way.
+    """
+    import xml.etree.ElementTree as ElementTree
+    import zipfile
+
+    try:
+        with zipfile.ZipFile(xlsx_path) as archive:
+            strings = []
+            if "xl/sharedStrings.xml" in archive.namelist():
+                table = ElementTree.fromstring(archive.read("xl/sharedStrings.xml"))
+                strings = [
+                    "".join(text.text or "" for text in item.iter(f"{_MAIN_NS}t"))
+                    for item in table.iter(f"{_MAIN_NS}si")
+                ]
+            relations = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+            targets = {relation.get("Id"): relation.get("Target") for relation in relations}
+            workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+
+            fingerprints = {}
+            for sheet in workbook.iter(f"{_MAIN_NS}sheet"):
+                target = targets[sheet.get(_REL_ID)]
+                part = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+                digest = hashlib.sha256()
+                for cell in ElementTree.fromstring(archive.read(part)).iter(f"{_MAIN_NS}c"):
+                    kind = cell.get("t")
+                    value = cell.find(f"{_MAIN_NS}v")
+                    text = (value.text or "") if value is not None else ""
+                    if kind == "s":
+                        text = strings[int(text)]
+                    elif kind == "inlineStr":
+                        text = "".join(item.text or "" for item in cell.iter(f"{_MAIN_NS}t"))
+                    digest.update(f"{cell.get('r')}\0{kind}\0{cell.get('s')}\0{text}\0".encode("utf-8"))
+                fingerprints[sheet.get("name")] = digest.hexdigest()
+            return fingerprints
+    except (OSError, KeyError, ValueError, IndexError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        logger.warning("Could not fingerprint the sheets of %s, parsing all of them: %s", xlsx_path, e)
+        return None
+
+
+def load_unchanged_sheets(xlsx_path, fingerprints):
+    """Variables of the last snapshot's sheets whose fingerprint is still the same, by sheet name."""
+    snapshot = _read_snapshot(cache_path_for(xlsx_path))
+    if snapshot is None or not fingerprints:
+        return {}
+    return {
+        name: sheet["variables"]
+        for name, sheet in snapshot["sheets"].items()
+        if fingerprints.get(name) == sheet["fingerprint"]
+    }
+
+
+def merge_sheets(sheets):
+    """Combine per-sheet variables ({kind: {name: fields}}) into (dict_int, dict_string, dict_bool, dict_credentials)."""
+    merged = {kind: {} for kind in VARIABLE_KINDS}
+    for variables in sheets.values():
+        for kind, values in variables.items():
+            merged[kind].update(values)
+    return tuple(merged[kind] for kind in VARIABLE_KINDS)
+
+
+def save_cached_config(xlsx_path, sheets, fingerprints):
+    """Write the snapshot for the current state of the workbook; ``sheets`` as for merge_sheets."""
+    stat = os.stat(xlsx_path)
+    snapshot = {
+        "version": CACHE_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _file_hash(xlsx_path),
+        "sheets": {
+            name: {
+                "fingerprint": (fingerprints or {}).get(name),
+                "variables": {kind: _convert(values) for kind, values in variables.items()},
+            }
+            for name, variables in sheets.items()
+        },
+    }
+    try:
+        _write_snapshot(cache_path_for(xlsx_path), snapshot)
+    except OSError as e:
+        logger.warning("Could not write config cache: %s", e)
+
+
+def _convert(variables):
+    return {
+        str(name): {key: _to_builtin(value) for key, value in fields.items()}
+        for name, fields in variables.items()
+    }
+
+
+def _write_snapshot(cache_path, snapshot):
+    """Replace the snapshot atomically so concurrent workers never read half a file."""
+    directory = os.path.dirname(cache_path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, separators=(",", ":"))
+        os.replace(temp_path, cache_path)
+    except Exception:
+        os.remove(temp_path)
+        raise
@@ -0,0 +1,159 @@
+"""
+Encrypted credential vault.
+
+Credentials are stored as one AES-256-GCM record per credential set, each with its
+own random 96-bit nonce and the record name as associated data, so records cannot be
+swapped or tampered with unnoticed. The key comes from the CREDENTIAL_VAULT_KEY
+environment variable (base64) or from a key file, never from the source code.
+
+The whole vault is decrypted in one pass with a single cipher instance and kept in a
+process-local cache until it expires or the vault file changes.
+
+Usage:
+    python -m reusables.credential_vault generate-key ../data/vault.key
+    python -m reusables.credential_vault set login_credentials --username user@example.com
+"""
+
+import argparse
+import base64
+import getpass
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+VAULT_PATH = "../data/credentials.vault"
+KEY_ENV = "CREDENTIAL_VAULT_KEY"
+KEY_FILE_ENV = "CREDENTIAL_VAULT_KEY_FILE"
+DEFAULT_KEY_FILE = "../data/vault.key"
+KEY_SIZE = 32  # AES-256
+NONCE_SIZE = 12
+VAULT_VERSION = 1
+
+# path -> (expires_at, vault mtime, decrypted records)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def load_key():
+    """Read the vault key from the environment or the key file."""
+    encoded = os.environ.get(KEY_ENV)
+    if not encoded:
+        key_file = os.environ.get(KEY_FILE_ENV, DEFAULT_KEY_FILE)
+        try:
+            with open(key_file, "rb") as file:
+                encoded = file.read().strip()
+        except FileNotFoundError:
+            raise ValueError(f"No vault key: set {KEY_ENV} or {KEY_FILE_ENV}, or create {key_file}")
+    key = base64.b64decode(encoded)
+    if len(key) != KEY_SIZE:
+        raise ValueError(f"Vault key must be {KEY_SIZE} bytes, got {len(key)}")
+    return key
+
+
+class CredentialVault:
+    def __init__(self, path=VAULT_PATH, key=None, ttl=300):
+        """
+        :param path: vault file
+        :param key: 32-byte key (default: load_key())
+        :param ttl: seconds the decrypted records stay cached in this process
+        """
+        self.path = path
+        self._key = key
+        self.ttl = ttl
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def _cipher(self):
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+        return AESGCM(self._key or load_key())
+
+    def load(self):
+        """Return {name: {"username": ..., "password": ...}}, decrypting only on a cache miss."""
+        mtime = os.stat(self.path).st_mtime_ns
+        now = time.monotonic()
+        with _cache_lock:
+            cached = _cache.get(self.path)
+            if cached and cached[0] > now and cached[1] == mtime:
+                return cached[2]
+
+            with open(self.path, encoding="utf-8") as file:
+                vault = json.load(file)
+            if vault.get("version") != VAULT_VERSION:
+                raise ValueError(f"Unsupported vault version: {vault.get('version')}")
+
+            aesgcm = self._cipher()
+            records = {}
+            for name, record in vault["records"].items():
+                plaintext = aesgcm.decrypt(
+                    base64.b64decode(record["nonce"]), base64.b64decode(record["ciphertext"]), name.encode("utf-8")
+                )
+                records[name] = json.loads(plaintext)
+
+            _cache[self.path] = (now + self.ttl, mtime, records)
+            return records
+
+    def save(self, records):
+        """Encrypt ``records`` with a fresh nonce each and replace the vault file atomically."""
+        aesgcm = self._cipher()
+        encrypted = {}
+        for name, values in records.items():
+            nonce = os.urandom(NONCE_SIZE)
+            ciphertext = aesgcm.encrypt(nonce, json.dumps(values).encode("utf-8"), name.encode("utf-8"))
+            encrypted[name] = {
+                "nonce": base64.b64encode(nonce).decode("ascii"),
+                "ciphertext": base64.b64encode(ciphertext).decode("ascii"),
+            }
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"version": VAULT_VERSION, "records": encrypted}, file, indent=2)
+            os.replace(temp_path, self.path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+        with _cache_lock:
+            _cache.pop(self.path, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the encrypted credential vault.")
+    parser.add_argument("--vault", default=VAULT_PATH, help=f"vault file (default: {VAULT_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate-key", help="write a new random key to a key file")
+    generate.add_argument("key_file", nargs="?", default=DEFAULT_KEY_FILE)
+
+    set_record = commands.add_parser("set", help="add or replace a credential set")
+    set_record.add_argument("name", help="credential set name, e.g. login_credentials")
+    set_record.add_argument("--username", required=True)
+
+    args = parser.parse_args(argv)
+    if args.command == "generate-key":
+        if os.path.exists(args.key_file):
+            print(f"{args.key_file} already exists, not overwriting it.")
+            return 1
+        fd = os.open(args.key_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(base64.b64encode(os.urandom(KEY_SIZE)))
+        print(f"Key written to {args.key_file}")
+        return 0
+
+    vault = CredentialVault(args.vault)
+    records = vault.load() if vault.exists() else {}
+    records = dict(records)
+    records[args.name] = {"username": args.username, "password": getpass.getpass("Password: ")}
+    vault.save(records)
+    print(f"Stored {args.name} in {args.vault}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Local cache of WebDriver binaries (chromedriver, geckodriver, msedgedriver).
+
+Drivers are stored under ``../drivers/<browser>/<major version>/`` and listed in
+``index.json``, so resolving one is a file lookup with no network access. A cache
+miss downloads the driver once through webdriver-manager, unless running offline.
+Air-gapped workers can be filled from a machine that has the drivers:
+
+    python -m reusables.driver_cache add chrome 131 /path/to/chromedriver
+    python -m reusables.driver_cache install chrome
+    python -m reusables.driver_cache list
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+DRIVER_CACHE_DIR = "../drivers"
+DRIVER_NAMES = {"chrome": "chromedriver", "firefox": "geckodriver", "edge": "msedgedriver"}
+
+
+def major_version(version):
+    """"131.0.6778.85" -> "131"; None if unknown."""
+    if not version:
+        return None
+    major = str(version).strip().split(".")[0]
+    return major if major.isdigit() else None
+
+
+class DriverCache:
+    def __init__(self, directory=DRIVER_CACHE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def resolve(self, browser, browser_version=None, driver_path=None, offline=False):
+        """
+        Path of the driver for ``browser``: ``driver_path`` if given, else the cached
+        driver for the browser's major version, else a freshly downloaded one.
+        :param offline: raise on a cache miss instead of downloading
+        """
+        if driver_path:
+            if not os.path.isfile(driver_path):
+                raise FileNotFoundError(f"Configured driver_path does not exist: {driver_path}")
+            return driver_path
+
+        major = major_version(browser_version)
+        path = self.lookup(browser, major)
+        if path:
+            return path
+        if offline:
+            raise FileNotFoundError(
+                f"No cached {DRIVER_NAMES.get(browser, browser)} for {browser} {major or '(unknown version)'} "
+                f"in {self.directory}; add one with: python -m reusables.driver_cache add {browser} <major> <path>"
+            )
+        return self.install(browser, major)
+
+    def lookup(self, browser, major=None):
+        """Cached driver for ``browser`` and ``major``, or the newest one if the version is unknown."""
+        drivers = self._load_index().get(browser, {})
+        if major is None and drivers:
+            major = max(drivers, key=int)
+        relative = drivers.get(major)
+        if relative:
+            path = os.path.join(self.directory, relative)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def add(self, browser, major, source_path):
+        """Copy a driver binary into the cache for ``browser`` ``major``."""
+        if browser not in DRIVER_NAMES:
+            raise ValueError(f"Unsupported browser for the driver cache: {browser}")
+        major = major_version(major)
+        if major is None:
+            raise ValueError("A numeric major browser version is required.")
+
+        target_dir = os.path.join(self.directory, browser, major)
+        os.makedirs(target_dir, exist_ok=True)
+        extension = ".exe" if source_path.lower().endswith(".exe") else ""
+        target = os.path.join(target_dir, DRIVER_NAMES[browser] + extension)
+        shutil.copy2(source_path, target)
+        os.chmod(target, os.stat(target).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+        with self._lock:
+            index = self._load_index()
+            index.setdefault(browser, {})[major] = os.path.relpath(target, self.directory)
+            self._save_index(index)
+        return target
+
+    def install(self, browser, major=None):
+        """Download the driver matching the installed browser with webdriver-manager and cache it."""
+        if browser == "chrome":
+            from webdriver_manager.chrome import ChromeDriverManager as Manager
+        elif browser == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager as Manager
+        elif browser == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager as Manager
+        else:
+            raise ValueError(f"Unsupported browser for the driver cache: {browser}")
+
+        downloaded = Manager().install()
+        if major is None:
+            # geckodriver is not tied to the Firefox version; keep it under the installed browser's major
+            from reusables.browser_detection import BrowserDetection
+
+            os_name, detected_browser, detected_version = BrowserDetection().get_os_browser_version()
+            major = major_version(detected_version) if detected_browser == browser else None
+        if major is None:
+            logger.warning("Unknown %s version, using %s without caching it.", browser, downloaded)
+            return downloaded
+        path = self.add(browser, major, downloaded)
+        logger.info("Cached %s for %s %s at %s", DRIVER_NAMES[browser], browser, major, path)
+        return path
+
+    def _index_path(self):
+        return os.path.join(self.directory, "index.json")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_index(self, index):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(index, file, indent=2)
+            os.replace(temp_path, self._index_path())
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the local WebDriver binary cache.")
+    parser.add_argument("--directory", default=DRIVER_CACHE_DIR, help=f"cache folder (default: {DRIVER_CACHE_DIR})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="copy a driver binary into the cache")
+    add.add_argument("browser", choices=sorted(DRIVER_NAMES))
+    add.add_argument("major", help="major browser version the driver belongs to, e.g. 131")
+    add.add_argument("path", help="driver binary to copy")
+
+    install = commands.add_parser("install", help="download the driver for the installed browser")
+    install.add_argument("browser", choices=sorted(DRIVER_NAMES))
+    install.add_argument("--major", default=None, help="major version to file it under (default: detected)")
+
+    commands.add_parser("list", help="show the cached drivers")
+
+    args = parser.parse_args(argv)
+    cache = DriverCache(args.directory)
+    if args.command == "add":
+        print(f"Cached at {cache.add(args.browser, args.major, args.path)}")
+    elif args.command == "install":
+        cache.install(args.browser, major_version(args.major))
+    else:
+        for browser, drivers in sorted(cache._load_index().items()):
+            for major, relative in sorted(drivers.items(), key=lambda item: int(item[0])):
+                print(f"{browser:8} {major:>4}  {os.path.join(args.directory, relative)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Import-time budget report.
+
+Runs ``python -X importtime`` on the given modules in a fresh interpreter and
+summarizes the output per top-level package, so heavy dependencies that sneak
+into the start-up path are easy to spot.
+
+Usage (from the repository root or the ``state`` folder):
+    python -m reusables.import_profile state.main --budget 300
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the peak memory of the child once the imports are done (not available on Windows)
+_RSS_SNIPPET = (
+    "\ntry:\n"
+    "    import resource\n"
+    "    print('maxrss_kb', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)\n"
+    "except ImportError:\n"
+    "    pass\n"
+)
+
+
+def profile_imports(modules):
+    """
+    Import ``modules`` in a child interpreter with ``-X importtime``.
+    :return: (list of (module, self_us, cumulative_us), peak RSS in KB or None)
+    """
+    code = "".join(f"import {module}\n" for module in modules) + _RSS_SNIPPET
+    env = dict(os.environ)
+    # The states import each other both as ``state.x`` and as top-level ``x``
+    paths = [ROOT_DIR, os.path.join(ROOT_DIR, "state")]
+    env["PYTHONPATH"] = os.pathsep.join(paths + [env["PYTHONPATH"]] if env.get("PYTHONPATH") else paths)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=os.path.join(ROOT_DIR, "state"),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    max_rss = None
+    for line in result.stdout.splitlines():
+        if line.startswith("maxrss_kb"):
+            max_rss = int(line.split()[1])
+    return entries, max_rss
+
+
+def summarize(entries, top=15):
+    """Aggregate self time per top-level package and pick the slowest imports."""
+    per_package = defaultdict(int)
+    for name, self_us, _ in entries:
+        per_package[name.split(".")[0]] += self_us
+    total_us = sum(per_package.values())
+    packages = sorted(per_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    slowest = sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]
+    return total_us, packages, slowest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize the import time of the given modules.")
+    parser.add_argument("modules", nargs="*", default=["state.main"], help="modules to import (default: state.main)")
+    parser.add_argument("--budget", type=float, default=None, help="fail if the total exceeds this many milliseconds")
+    parser.add_argument("--top", type=int, default=15, help="number of rows to show")
+    args = parser.parse_args(argv)
+
+    entries, max_rss = profile_imports(args.modules)
+    total_us, packages, slowest = summarize(entries, args.top)
+
+    print(f"Imported {len(entries)} modules in {total_us / 1000:.1f} ms")
+    if max_rss is not None:
+        print(f"Peak RSS after imports: {max_rss / 1024:.1f} MB")
+    print("\nSelf time per top-level package:")
+    for package, self_us in packages:
+        print(f"  {self_us / 1000:9.1f} ms  {package}")
+    print("\nSlowest imports (cumulative):")
+    for name, _, cumulative_us in slowest:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    if args.budget is not None and total_us / 1000 > args.budget:
+        print(f"\nImport budget of {args.budget:.0f} ms exceeded.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,134 @@
+"""
+Process-wide logging setup.
+
+Bot threads only put the record on a queue (a few microseconds); a QueueListener
+thread formats it and writes one JSON object per line to a rotating file of its own
+per process (``../Logs/project_<pid>.jsonl``), so runs and concurrent bots never
+truncate or interleave each other's logs, and one plain line to the console. Messages use %-style arguments and are
+only formatted by the listener, and only if the level is enabled.
+
+Each line carries the bot, item and state of the thread that logged it, taken from
+the tracer's state context when the record is created.
+
+Importing this module configures logging once (state.main sets it up first thing);
+``set_level`` changes the level at runtime and ``stop`` drains the queue (it also runs
+at exit).
+"""
+
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+
+from reusables.tracer import current_state
+
+LOG_DIRECTORY = "../Logs"
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+CONSOLE_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+# Actions and page objects log every step; the console only shows their warnings
+CONSOLE_QUIET_LOGGERS = ("library", "automation", "sub_process")
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; runs on the listener thread."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "bot_id": getattr(record, "bot_id", None),
+            "item_id": getattr(record, "item_id", None),
+            "state": getattr(record, "state", None),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleFilter(logging.Filter):
+    """Keep the step-by-step INFO records of CONSOLE_QUIET_LOGGERS in the file only."""
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or record.name.split(".", 1)[0] not in CONSOLE_QUIET_LOGGERS
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue the record without formatting it.
+
+    The stock QueueHandler formats the message in the calling thread; this one only
+    attaches the bot/item/state context, which lives in the caller's context variables.
+    """
+
+    def prepare(self, record):
+        state = current_state()
+        record.bot_id = state.get("bot_id")
+        record.item_id = state.get("item_id")
+        record.state = state.get("state")
+        return record
+
+
+def setup(level=logging.INFO, directory=LOG_DIRECTORY):
+    """Route the root logger through the queue to this process's log file; idempotent."""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(directory, f"project_{os.getpid()}.jsonl"),
+            maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8", delay=True,
+        )
+        file_handler.setFormatter(JsonFormatter())
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        console_handler.addFilter(ConsoleFilter())
+
+        # The lines carry no process name, so skip looking it up per record
+        logging.logMultiprocessing = False
+
+        log_queue = queue.SimpleQueue()
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(ContextQueueHandler(log_queue))
+        root.setLevel(level)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(stop)
+
+
+def set_level(level):
+    """Change the level of the root logger, e.g. "DEBUG" or logging.WARNING."""
+    logging.getLogger().setLevel(level)
+
+
+def stop():
+    """Write out every queued record and stop the listener thread."""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
 
-logging.basicConfig(
-    filename="../project.log",
-    filemode='w',
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
\ No newline at end of file
+setup()
@@ -1,17 +1,47 @@
+import base64
+import collections
+import io
+import itertools
+import json
+import logging
+import queue
 import threading
 import time
-import mss
 import os  # For folder management
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-import imageio
+import re
 from datetime import datetime, timezone
 
+logger = logging.getLogger(__name__)
+
+# mss, numpy, PIL and imageio are imported by the recording threads only,
+# so importing this module costs nothing when recording is off.
+
 # Global variables for recording state and resolution reduction factor
-recording = False
-record_thread = None
+# Running recorders: None for the screen, the bot id for a browser recording
+_recorders = {}
+_recorders_lock = threading.Lock()
 RESOLUTION_REDUCTION_FACTOR = 1
 
+# What to do when capture falls behind its deadlines or the encoder falls behind capture
+DUPLICATE = "duplicate"  # repeat the last frame for the missed slots, so video time matches wall time
+DROP = "drop"  # skip the missed slots, so the video gets shorter but encodes less
+
+# Recording modes
+FULL = "full"  # encode the whole run to one video
+FAILURE = "failure"  # keep the last seconds in memory and only save them when an item fails
+RECORD_MODES = (FULL, FAILURE)
+
+# Change detection compares every Nth pixel in both directions of consecutive frames,
+# and a full frame is sent at least this often to catch changes smaller than the grid
+CHANGE_SAMPLE_STEP = 4
+FULL_REFRESH_SECONDS = 2
+
+# stop_recording() default: every running recording
+ALL = object()
+
+# A raw full-HD frame is about 8 MB, so the queue only absorbs short encoder hiccups
+DEFAULT_QUEUE_SIZE = 8
+
 
 def start_recording(
     output_file_prefix="output",
@@ -19,11 +49,25 @@ def start_recording(
     font_size=20,
     text_color=(255, 255, 255, 128),
     stroke_color=(0, 0, 0, 255),
-    fps=15
+    fps=15,
+    late_policy=DUPLICATE,
+    queue_size=None,
+    mode=FULL,
+    buffer_seconds=30,
+    buffer_mb=256,
+    segment_seconds=300,
+    segment_mb=100,
+    keep_segments=48,
+    driver=None,
+    bot_id=None,
 ):
     """
     Start screen recording with a watermark overlay.
 
+    Without a driver the primary monitor is recorded, once per process. With a driver
+    only that browser's viewport is recorded, which also works headless, and each bot
+    can have its own recording.
+
     Parameters:
         output_file_prefix (str): Prefix for the recorded video file name.
         watermark_text (str): Text to display as a watermark.
@@ -31,63 +75,863 @@ def start_recording(
         text_color (tuple): RGBA color for watermark text.
         stroke_color (tuple): RGBA stroke color for the watermark text.
         fps (int): Frames per second for the recording.
+        late_policy (str): DUPLICATE or DROP, see ScreenRecorder.
+        queue_size (int): Raw frames buffered between capture and encoding.
+        mode (str): FULL to record the whole run, FAILURE to keep only a ring buffer
+            that save_failure_clip() writes out.
+        buffer_seconds (int): Seconds kept in the ring buffer in FAILURE mode.
+        buffer_mb (int): Memory the ring buffer may use in FAILURE mode; fewer seconds
+            are kept when the screen changes a lot.
+        segment_seconds (int): Video seconds per segment in FULL mode.
+        segment_mb (int): Maximum size of a segment in FULL mode.
+        keep_segments (int): Segments kept across runs in FULL mode, 0 to keep all.
+        driver: Selenium driver to record instead of the screen.
+        bot_id (int): Bot the driver belongs to; its files get a _bot<id> suffix.
     """
-    global recording, record_thread
-    if not recording:
+    with _recorders_lock:
+        if bot_id in _recorders:
+            return
+        if driver is None and bot_id is not None:
+            raise ValueError("Only browser recordings belong to a bot; pass its driver.")
+
         # Ensure the output directory exists
         output_dir = os.path.dirname(output_file_prefix)
         if output_dir and not os.path.exists(output_dir):
             os.makedirs(output_dir)
+        if bot_id is not None:
+            output_file_prefix = f"{output_file_prefix}_bot{bot_id}"
 
-        # Append current GMT date and time to the file name
-        current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
-        output_file = f"{output_file_prefix}_{current_time}.mp4"
+        if mode == FULL:
+            sink = VideoSink(output_file_prefix, fps, segment_seconds, segment_mb, keep_segments)
+        elif mode == FAILURE:
+            sink = RingBufferSink(
+                output_file_prefix, fps, buffer_seconds, buffer_mb,
+                watermark_args=(watermark_text, font_size, text_color, stroke_color),
+            )
+        else:
+            raise ValueError(f"Unknown recording mode: {mode}")
 
-        recording = True
-        record_thread = threading.Thread(
-            target=_record_screen,
-            args=(output_file, watermark_text, font_size, text_color, stroke_color, fps)
+        source = ScreenSource() if driver is None else BrowserSource(driver)
+        recorder = ScreenRecorder(
+            sink, watermark_text, font_size, text_color, stroke_color, fps,
+            late_policy=late_policy, queue_size=queue_size, source=source,
         )
-        record_thread.start()
+        _recorders[bot_id] = recorder
+        recorder.start()
 
 
-def stop_recording():
+def stop_recording(bot_id=ALL, failure_tag=None):
     """
-    Stop the ongoing screen recording.
+    Stop the ongoing recordings, or only the one of ``bot_id`` (None for the screen).
+
+    With ``failure_tag`` the ring buffer of each stopped FAILURE mode recording is
+    saved as it stops, for an item that fails as its browser is closed.
+
+    Returns:
+        RecordingStats of the last stopped recording, or None if nothing was recording.
     """
-    global recording, record_thread
-    if recording:
-        recording = False
-        record_thread.join()
+    with _recorders_lock:
+        if bot_id is ALL:
+            stopping = list(_recorders.items())
+            _recorders.clear()
+        else:
+            stopping = [(bot_id, _recorders.pop(bot_id))] if bot_id in _recorders else []
+
+    stats = None
+    for key, recorder in stopping:
+        if failure_tag is not None and isinstance(recorder.sink, RingBufferSink):
+            recorder.sink.pending_tag = failure_tag  # Saved once the queued frames are in the buffer
+        stats = recorder.stop()
+        logger.info("Recording%s stopped (%s): %s", "" if key is None else f" of bot {key}", recorder.sink, stats)
+    return stats
+
+
+def is_recording():
+    return bool(_recorders)
+
 
+def recording_drivers():
+    """{bot id: driver} of the running browser recordings, e.g. to restart them."""
+    return {
+        key: recorder.source.driver
+        for key, recorder in list(_recorders.items())
+        if isinstance(recorder.source, BrowserSource)
+    }
 
-def _record_screen(output_file, watermark_text, font_size, text_color, stroke_color, fps):
+
+def _recorder_for(bot_id):
+    """The bot's own browser recording, else the screen recording."""
+    recorder = _recorders.get(bot_id) if bot_id is not None else None
+    return recorder or _recorders.get(None)
+
+
+def mark(**values):
     """
-    Internal function to handle screen recording logic.
+    Record an event such as the item and state a bot is in, so it can be found in
+    the recording. Marks never block the bot; they land after the frames captured before them.
+    """
+    recorder = _recorder_for(values.get("bot_id"))
+    if recorder is not None:
+        recorder.mark(values)
 
-    Parameters:
-        output_file (str): Path to save the recorded video.
-        watermark_text (str): Text to display as a watermark.
-        font_size (int): Font size of the watermark.
-        text_color (tuple): RGBA color for watermark text.
-        stroke_color (tuple): RGBA stroke color for the watermark text.
-        fps (int): Frames per second for the recording.
+
+def save_failure_clip(tag, bot_id=None):
     """
-    global RESOLUTION_REDUCTION_FACTOR
+    Write the ring buffer to a video tagged with ``tag`` (e.g. the item id).
+    Does nothing unless a FAILURE mode recording is running.
+    """
+    recorder = _recorder_for(bot_id)
+    if recorder is not None and isinstance(recorder.sink, RingBufferSink):
+        return recorder.sink.save(tag)
+
 
-    # Capture the screen using mss
-    with mss.mss() as sct:
-        monitor = sct.monitors[1]  # Adjust index for multiple monitors
-        width, height = monitor["width"], monitor["height"]
+def _timestamp():
+    """Current GMT date and time for file names."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
 
-        # Calculate adjusted resolution (must be divisible by 16 for video encoding)
-        width_adjusted = int((width / RESOLUTION_REDUCTION_FACTOR + 15) // 16 * 16)
-        height_adjusted = int((height / RESOLUTION_REDUCTION_FACTOR + 15) // 16 * 16)
 
-        # Initialize the video writer with proper settings
-        writer = imageio.get_writer(
-            output_file, fps=fps, codec="libx264", format="FFMPEG", quality=5, pixelformat='yuv420p'
+class VideoSink:
+    """
+    Encodes every frame to H.264, split into segments of at most ``segment_seconds``
+    of video or ``segment_mb`` megabytes.
+
+    Segments are fragmented mp4, so everything up to the last keyframe stays playable
+    if the process dies before the writer is closed. Every segment and every
+    ``mark()`` is appended to ``<prefix>_<run>.index.jsonl`` with its offset in the
+    segment, and only the newest ``keep_segments`` segments of all runs are kept.
+    """
+
+    def __init__(self, output_file_prefix, fps, segment_seconds=300, segment_mb=100, keep_segments=48):
+        self.output_file_prefix = output_file_prefix
+        self.run = _timestamp()
+        self.index_file = f"{output_file_prefix}_{self.run}.index.jsonl"
+        self.fps = fps
+        self.segment_slots = int(segment_seconds * fps)
+        self.segment_bytes = segment_mb * 1024 * 1024
+        self.keep_segments = keep_segments
+        self.output_file = None  # current segment
+        self.segments = 0
+        self._writer = None
+        self._slots = 0  # slots written to the current segment
+        self._run_slots = 0  # slots written by the whole run
+        self._size_checked_at = 0  # value of _slots at the last segment size check
+
+    def write(self, frame, repeat):
+        if self._writer is None or self._segment_full():
+            self._rotate()
+        for _ in range(repeat):
+            self._writer.append_data(frame)
+        self._slots += repeat
+        self._run_slots += repeat
+
+    def mark(self, values):
+        """Record where ``values`` (item, state, ...) happened in the current segment."""
+        if self._writer is None:
+            self._rotate()
+        self._append_index({
+            "event": "mark",
+            "segment": os.path.basename(self.output_file),
+            "offset": round(self._slots / self.fps, 3),
+            **values,
+        })
+
+    def close(self):
+        # Finalize the video writer
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _segment_full(self):
+        if self._slots >= self.segment_slots:
+            return True
+        # The file size lags behind what ffmpeg buffers, so checking once a second of video is enough;
+        # writes advance by whole repeats (missed and held slots), so count slots rather than hit a multiple
+        if self._slots - self._size_checked_at >= self.fps:
+            self._size_checked_at = self._slots
+            try:
+                return os.path.getsize(self.output_file) >= self.segment_bytes
+            except OSError:
+                return False
+        return False
+
+    def _rotate(self):
+        import imageio
+
+        self.close()
+        self.segments += 1
+        self.output_file = f"{self.output_file_prefix}_{self.run}_{self.segments:04d}.mp4"
+        # Initialize the video writer with proper settings; fragments keep a crashed segment readable
+        self._writer = imageio.get_writer(
+            self.output_file, fps=self.fps, codec="libx264", format="FFMPEG", quality=5, pixelformat='yuv420p',
+            output_params=["-movflags", "frag_keyframe+empty_moov"],
         )
+        self._slots = 0
+        self._size_checked_at = 0
+        self._append_index({
+            "event": "segment",
+            "segment": os.path.basename(self.output_file),
+            "run_offset": round(self._run_slots / self.fps, 3),
+            "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        })
+        self._remove_old_segments()
+
+    def _append_index(self, entry):
+        with open(self.index_file, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, default=str) + "\n")
+
+    def _remove_old_segments(self):
+        """Delete the oldest segments beyond ``keep_segments``, and indexes left without segments."""
+        if not self.keep_segments:
+            return
+        directory = os.path.dirname(self.output_file_prefix) or "."
+        prefix = os.path.basename(self.output_file_prefix)
+        pattern = re.compile(re.escape(prefix) + r"_(\d{4}-\d\d-\d\d_\d\d-\d\d-\d\d)_\d{4}\.mp4$")
+
+        # Timestamped names sort chronologically; the current segment may not be on disk yet
+        current = os.path.basename(self.output_file)
+        segments = sorted(name for name in os.listdir(directory) if pattern.match(name) and name != current)
+        kept = segments[len(segments) - (self.keep_segments - 1):] if self.keep_segments > 1 else []
+        for name in segments[:len(segments) - len(kept)]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                logger.warning("Could not remove old recording %s: %s", name, e)
+
+        runs = {pattern.match(name).group(1) for name in kept}
+        index_pattern = re.compile(re.escape(prefix) + r"_(\d{4}-\d\d-\d\d_\d\d-\d\d-\d\d)\.index\.jsonl$")
+        for name in os.listdir(directory):
+            match = index_pattern.match(name)
+            if match and match.group(1) not in runs and match.group(1) != self.run:
+                os.remove(os.path.join(directory, name))
+
+    def __str__(self):
+        return f"{self.segments} segment(s) indexed in {self.index_file}"
+
+
+class RingBufferSink:
+    """
+    Keeps the last ``seconds`` of frames in memory and writes them to a video only when
+    asked, so a run without failures costs no disk writes and no encoding.
+
+    The encoder hands over the changed region of each frame, before the watermark; the
+    ring keeps those patches as they are (at most ``max_mb`` of them) and folds the ones
+    that fall out into a full starting frame. Rebuilding the frames, watermarking and
+    H.264 encoding all happen in ``save()``, on a thread of its own.
+    """
+
+    keeps_damage = True  # takes write_damage() instead of write()
+
+    def __init__(self, output_file_prefix, fps, seconds, max_mb=256, watermark_args=None):
+        """
+        Parameters:
+            watermark_args (tuple): (text, font_size, text_color, stroke_color) of the
+                watermark added when a clip is saved, None for none.
+        """
+        self.output_file_prefix = output_file_prefix
+        self.fps = fps
+        self.capacity = int(seconds * fps)  # frame slots kept
+        self.max_bytes = max_mb * 1024 * 1024
+        self.watermark_args = watermark_args
+        self.saved = []
+        self.pending_tag = None  # a clip to save when the recording stops
+        self._start = None  # the screen before the oldest patch
+        self._frames = collections.deque()  # [patch, left, top, repeat]
+        self._slots = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._savers = []
+
+    def write_damage(self, canvas, box, repeat):
+        """
+        Keep the ``box`` (left, top, right, bottom) region of ``canvas`` for ``repeat``
+        slots; without a box the previous frame is shown for ``repeat`` more slots.
+        """
+        import numpy as np
+
+        with self._lock:
+            if self._start is None:
+                self._start = np.zeros_like(canvas)
+            if box is None:
+                if not self._frames:
+                    return
+                self._frames[-1][3] += repeat
+            else:
+                left, top, right, bottom = box
+                patch = canvas[top:bottom, left:right].copy()
+                self._frames.append([patch, left, top, repeat])
+                self._bytes += patch.nbytes
+            self._slots += repeat
+            while len(self._frames) > 1 and (
+                    self._slots - self._frames[0][3] >= self.capacity or self._bytes > self.max_bytes):
+                patch, left, top, repeat = self._frames.popleft()
+                self._start[top:top + patch.shape[0], left:left + patch.shape[1]] = patch
+                self._slots -= repeat
+                self._bytes -= patch.nbytes
+
+    def save(self, tag):
+        """Encode the current buffer to ``<prefix>_failure_<tag>_<time>.mp4`` in the background."""
+        with self._lock:
+            if not self._frames:
+                return None
+            start = self._start.copy()
+            frames = [tuple(entry) for entry in self._frames]
+        safe_tag = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(tag))
+        output_file = f"{self.output_file_prefix}_failure_{safe_tag}_{_timestamp()}.mp4"
+        saver = threading.Thread(
+            target=self._encode, args=(output_file, start, frames), name="recorder-failure-clip", daemon=True
+        )
+        saver.start()
+        self._savers.append(saver)
+        self.saved.append(output_file)
+        return output_file
+
+    def _encode(self, output_file, canvas, frames):
+        import imageio
+
+        height, width = canvas.shape[:2]
+        watermark = Watermark(*self.watermark_args, (width, height)) if self.watermark_args else None
+        output = canvas.copy()
+        if watermark is not None:
+            watermark.apply(output)
+        try:
+            with imageio.get_writer(
+                output_file, fps=self.fps, codec="libx264", format="FFMPEG", quality=5, pixelformat='yuv420p',
+            ) as writer:
+                for patch, left, top, repeat in frames:
+                    right, bottom = left + patch.shape[1], top + patch.shape[0]
+                    canvas[top:bottom, left:right] = patch
+                    output[top:bottom, left:right] = patch
+                    if watermark is not None and watermark.overlaps((left, top, right, bottom)):
+                        watermark.apply(output, canvas)
+                    for _ in range(repeat):
+                        writer.append_data(output)
+            logger.info("Failure clip saved to %s", output_file)
+        except Exception as e:
+            logger.error("Failed to save failure clip %s: %s", output_file, e)
+
+    def mark(self, values):
+        """Clips are tagged when they are saved, so marks are not kept."""
+
+    def close(self):
+        if self.pending_tag is not None:
+            self.save(self.pending_tag)
+        # Let clips that are still encoding finish, then free the buffer
+        for saver in self._savers:
+            saver.join()
+        with self._lock:
+            self._start = None
+            self._frames.clear()
+            self._slots = 0
+            self._bytes = 0
+
+    def __str__(self):
+        return f"ring buffer, {len(self.saved)} failure clip(s) saved"
+
+
+class RecordingStats:
+    """Counters shared by the capture and encode stages."""
+
+    __slots__ = ("started_at", "stopped_at", "captured", "unavailable", "encoded", "processed", "partial", "static",
+                 "duplicated", "skipped", "dropped", "lag_total", "lag_max")
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.stopped_at = None
+        self.captured = 0  # frames grabbed from the screen
+        self.unavailable = 0  # grabs that returned no frame, the previous one was held instead
+        self.encoded = 0  # frame slots written to the video, repeats included
+        self.processed = 0  # distinct frames converted and watermarked
+        self.partial = 0  # of those, frames where only the changed region was processed
+        self.static = 0  # slots that repeated the previous frame because nothing changed
+        self.duplicated = 0  # slots filled by repeating a frame after missed deadlines
+        self.skipped = 0  # slots left out under the DROP policy
+        self.dropped = 0  # captured frames thrown away because the encoder was behind
+        self.lag_total = 0.0  # seconds between capture and encoding, summed over processed frames
+        self.lag_max = 0.0
+
+    @property
+    def elapsed(self):
+        return (self.stopped_at or time.monotonic()) - self.started_at
+
+    @property
+    def capture_fps(self):
+        return self.captured / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def achieved_fps(self):
+        """Distinct frames per second that made it into the video."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def average_lag(self):
+        return self.lag_total / self.processed if self.processed else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.elapsed:.1f}s, captured {self.captured} ({self.capture_fps:.1f} fps, "
+            f"{self.unavailable} unavailable), "
+            f"encoded {self.encoded} slots from {self.processed} distinct frames ({self.achieved_fps:.1f} fps, "
+            f"{self.partial} partial), static {self.static}, duplicated {self.duplicated}, "
+            f"skipped {self.skipped}, dropped {self.dropped}, "
+            f"encode lag avg {self.average_lag * 1000:.0f} ms / max {self.lag_max * 1000:.0f} ms"
+        )
+
+
+class ScreenRecorder:
+    """
+    Screen recorder split into a capture thread and an encode thread joined by a
+    bounded queue.
+
+    The capture thread grabs a frame at every deadline of a monotonic clock, so the
+    frame rate does not drift with the time spent grabbing. When it misses deadlines
+    the late policy decides whether the missed slots are filled with duplicates
+    (timing stays accurate) or skipped. When the encoder falls behind and the queue is
+    full, the captured frame is dropped rather than blocking capture, and under the
+    DUPLICATE policy its slot is carried over to the next frame that gets through.
+
+    Screens are mostly static between actions, so capture compares a downsampled copy
+    of each frame with the last one it sent. Unchanged frames are only counted, and the
+    encoder repeats its last output for them; changed frames carry the bounding box of
+    the change and only that region is copied and re-watermarked.
+    """
+
+    def __init__(self, sink, watermark_text, font_size, text_color, stroke_color, fps,
+                 late_policy=DUPLICATE, queue_size=None, source=None):
+        """
+        Parameters:
+            sink: VideoSink or RingBufferSink the encode stage writes the watermarked frames to.
+            source: ScreenSource (default) or BrowserSource the capture stage grabs frames from.
+        """
+        if late_policy not in (DUPLICATE, DROP):
+            raise ValueError(f"Unknown late policy: {late_policy}")
+        self.sink = sink
+        self.source = source or ScreenSource()
+        self.watermark_args = (watermark_text, font_size, text_color, stroke_color)
+        self.fps = fps
+        self.late_policy = late_policy
+        self.stats = RecordingStats()
+        self._frames = queue.Queue(maxsize=queue_size or DEFAULT_QUEUE_SIZE)
+        self._marks = collections.deque()  # (monotonic time, values), merged in by the encoder
+        self._running = threading.Event()
+        self._capture_thread = None
+        self._encode_thread = None
+        self._error = None
+
+    def start(self):
+        self._running.set()
+        self._capture_thread = threading.Thread(target=self._capture_loop, name="recorder-capture", daemon=True)
+        self._encode_thread = threading.Thread(target=self._encode_loop, name="recorder-encode", daemon=True)
+        self._capture_thread.start()
+        self._encode_thread.start()
+
+    def stop(self):
+        """Stop capturing, let the encoder drain the queue and close the video."""
+        self._running.clear()
+        self._capture_thread.join()
+        self.stats.stopped_at = time.monotonic()
+        self._encode_thread.join()
+        if self._error:
+            logger.error("Recording failed: %s", self._error)
+        return self.stats
+
+    def mark(self, values):
+        # Kept out of the frame queue, so marks neither wait for the encoder nor take a frame's place
+        if self._running.is_set():
+            self._marks.append((time.monotonic(), dict(values, time=time.time())))
+
+    def _write_marks(self, until):
+        """Hand the sink the marks made before ``until`` (monotonic), in order."""
+        while self._marks and self._marks[0][0] <= until:
+            self.sink.mark(self._marks.popleft()[1])
+
+    def _capture_loop(self):
+        try:
+            with self.source as source:
+                interval = 1 / self.fps
+                deadline = time.monotonic()
+                carried = 0  # slots owed by frames dropped on a full queue
+                held = 0  # static slots not handed to the encoder yet
+                previous = None  # downsampled copy of the last frame handed to the encoder
+                last_full = deadline
+
+                while self._running.is_set():
+                    now = time.monotonic()
+                    if now < deadline:
+                        time.sleep(deadline - now)
+                        continue
+
+                    # Whole frame slots that passed while we were busy
+                    missed = int((now - deadline) / interval)
+                    deadline += (missed + 1) * interval
+
+                    # Capture the current frame as an RGB array
+                    frame = source.grab()
+
+                    if self.late_policy == DUPLICATE:
+                        repeat = 1 + missed + carried
+                        self.stats.duplicated += missed + carried
+                    else:
+                        repeat = 1
+                        self.stats.skipped += missed
+                    carried = 0
+
+                    if frame is None:
+                        # No frame this time (a dialog is open, the browser is busy): hold the last one
+                        self.stats.unavailable += 1
+                        held += repeat
+                        if held >= self.fps and self._offer((now, None, held, None)):
+                            held = 0
+                        continue
+                    self.stats.captured += 1
+
+                    sample = frame[::CHANGE_SAMPLE_STEP, ::CHANGE_SAMPLE_STEP].copy()
+                    if now - last_full >= FULL_REFRESH_SECONDS:
+                        previous = None  # Catch changes smaller than the sampling grid
+                    box = _damage_box(previous, sample, frame.shape)
+
+                    if box is None:
+                        # Nothing changed: the encoder repeats its last frame, in batches
+                        held += repeat
+                        self.stats.static += repeat
+                        if held >= self.fps and self._offer((now, None, held, None)):
+                            held = 0
+                        continue
+
+                    if held and self._offer((now, None, held, None)):
+                        held = 0
+                    if not held and self._offer((now, frame, repeat, box)):
+                        previous = sample
+                        if box == (0, 0, frame.shape[1], frame.shape[0]):
+                            last_full = now
+                        continue
+
+                    # The encoder is behind, so this frame is lost and the next one is sent in full
+                    self.stats.dropped += 1
+                    previous = None
+                    if self.late_policy == DUPLICATE:
+                        carried = repeat
+                    else:
+                        self.stats.skipped += 1
+
+                if held:
+                    self._frames.put((time.monotonic(), None, held, None))
+        except Exception as e:
+            self._error = e
+        finally:
+            self._frames.put(None)  # Tell the encoder to finish
+
+    def _offer(self, item):
+        try:
+            self._frames.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def _encode_loop(self):
+        import numpy as np
+        from PIL import Image
+
+        damage_only = getattr(self.sink, "keeps_damage", False)
+        watermark = None
+        base = None  # the screen as last seen, without watermark
+        output = None  # base with the watermark blended in
+        shape = None  # shape of the last frame
+        try:
+            while True:
+                item = self._frames.get()
+                if item is None:
+                    self._write_marks(float("inf"))
+                    break
+                captured_at, frame, repeat, box = item
+                self._write_marks(captured_at)
+
+                if frame is None:
+                    # Static slots: repeat the last frame without touching it
+                    if base is not None and damage_only:
+                        self.sink.write_damage(base, None, repeat)
+                    elif base is not None:
+                        self.sink.write(output, repeat)
+                    self.stats.encoded += repeat
+                    continue
+
+                height, width = frame.shape[:2]
+                if base is None:
+                    # Calculate adjusted resolution (must be divisible by 16 for video encoding)
+                    size = (
+                        int((width / RESOLUTION_REDUCTION_FACTOR + 15) // 16 * 16),
+                        int((height / RESOLUTION_REDUCTION_FACTOR + 15) // 16 * 16),
+                    )
+                    base = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+                    if not damage_only:
+                        # Render the watermark once for the whole recording
+                        watermark = Watermark(*self.watermark_args, size)
+                        output = base.copy()
+
+                resized_window = frame.shape != shape
+                if resized_window:
+                    # A resized browser window must not leave parts of the old frame behind
+                    base[...] = 0
+                    shape = frame.shape
+
+                if RESOLUTION_REDUCTION_FACTOR == 1:
+                    # Copy only the changed region; the canvas is padded to the encoder size
+                    left, top = box[0], box[1]
+                    right, bottom = min(box[2], size[0]), min(box[3], size[1])
+                    base[top:bottom, left:right] = frame[top:bottom, left:right]
+                    if (right - left) * (bottom - top) < width * height:
+                        self.stats.partial += 1
+                else:
+                    # Resize the frame based on the resolution reduction factor
+                    resized = Image.fromarray(np.ascontiguousarray(frame)).resize(size, Image.BICUBIC)
+                    base[...] = np.asarray(resized)
+                    left, top, right, bottom = 0, 0, size[0], size[1]
+                if resized_window:
+                    left, top, right, bottom = 0, 0, size[0], size[1]
+
+                if damage_only:
+                    # The sink watermarks and encodes when (if ever) it saves a clip
+                    self.sink.write_damage(base, (left, top, right, bottom), repeat)
+                else:
+                    output[top:bottom, left:right] = base[top:bottom, left:right]
+                    if watermark.overlaps((left, top, right, bottom)):
+                        watermark.apply(output, base)
+                    # Write the frame once per slot it covers
+                    self.sink.write(output, repeat)
+
+                lag = time.monotonic() - captured_at
+                self.stats.encoded += repeat
+                self.stats.processed += 1
+                self.stats.lag_total += lag
+                self.stats.lag_max = max(self.stats.lag_max, lag)
+        except Exception as e:
+            self._error = e
+            self._running.clear()
+            # Unblock the capture thread if it is waiting on the full queue
+            while self._frames.get() is not None:
+                pass
+        finally:
+            self.sink.close()
+
+
+class ScreenSource:
+    """Grabs the primary monitor with mss; needs a desktop session."""
+
+    def __enter__(self):
+        import mss
+
+        self._sct = mss.mss()
+        self._monitor = self._sct.monitors[1]  # Adjust index for multiple monitors
+        return self
+
+    def __exit__(self, *exc_info):
+        self._sct.close()
+
+    def grab(self):
+        import numpy as np
+
+        img = self._sct.grab(self._monitor)
+        # BGRA rows straight from the mss buffer, viewed as RGB without copying
+        return np.frombuffer(img.bgra, dtype=np.uint8).reshape(img.height, img.width, 4)[..., 2::-1]
+
+
+class BrowserSource:
+    """
+    Grabs the viewport of one Selenium browser, which works headless and records
+    nothing but that browser.
+
+    The bot drives the same browser at the same time, so a screenshot must never go
+    through its WebDriver session: there it fails on an open alert, and the default
+    prompt handling may dismiss the alert the bot is waiting for. Chromium browsers
+    are captured over a DevTools connection of the recorder's own (JPEG
+    Page.captureScreenshot), which follows the most recently active tab and reports
+    JavaScript dialogs, so frames are skipped while one is open. Other browsers, and
+    remote ones whose DevTools port is out of reach, fall back to WebDriver
+    screenshots taken only when no alert is open.
+
+    A failed grab returns None: that frame is lost and the connection is reopened on
+    the next grab.
+    """
+
+    TARGET_POLL_SECONDS = 1  # how often the active tab is looked up
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._address = _debugger_address(driver)
+        self._page = None  # _DevToolsPage of the recorded tab
+        self._target_checked = 0
+        self._failing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._close_page()
+
+    def grab(self):
+        import numpy as np
+        from PIL import Image
+
+        try:
+            data = self._grab_devtools() if self._address else self._grab_webdriver()
+        except Exception as e:
+            if not self._failing:
+                logger.warning("Browser frame not captured, retrying with the next frame: %s", e)
+            self._failing = True
+            self._close_page()
+            return None
+        self._failing = False
+        if data is None:
+            return None
+        return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+    def _grab_devtools(self):
+        now = time.monotonic()
+        if self._page is None or now - self._target_checked >= self.TARGET_POLL_SECONDS:
+            self._target_checked = now
+            target = _active_page_target(self._address)
+            if self._page is None or self._page.target_id != target["id"]:
+                self._close_page()
+                self._page = _DevToolsPage(target)
+        if self._page.dialog_open():
+            return None
+        result = self._page.call(
+            "Page.captureScreenshot", {"format": "jpeg", "quality": 80, "optimizeForSpeed": True}
+        )
+        return base64.b64decode(result["data"])
+
+    def _grab_webdriver(self):
+        from selenium.common.exceptions import NoAlertPresentException
+
+        try:
+            _ = self.driver.switch_to.alert.text  # Reading the text leaves the alert open
+            return None
+        except NoAlertPresentException:
+            pass
+        return self.driver.get_screenshot_as_png()
+
+    def _close_page(self):
+        if self._page is not None:
+            self._page.close()
+            self._page = None
+
+
+def _debugger_address(driver):
+    """host:port of a local Chromium browser's DevTools endpoint, None for other or remote browsers."""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    capabilities = driver.capabilities
+    for key in ("goog:chromeOptions", "ms:edgeOptions"):
+        address = (capabilities.get(key) or {}).get("debuggerAddress")
+        if address:
+            return address
+    return None
+
+
+def _active_page_target(address):
+    """The tab the bot is on: Chromium lists the most recently active target first."""
+    from urllib.request import urlopen
+
+    with urlopen(f"http://{address}/json/list", timeout=_DevToolsPage.TIMEOUT) as response:
+        targets = json.load(response)
+    for target in targets:
+        if target.get("type") == "page" and target.get("webSocketDebuggerUrl"):
+            return target
+    raise RuntimeError("no page to record")
+
+
+class _DevToolsPage:
+    """A DevTools websocket to one tab, next to (not through) the bot's WebDriver session."""
+
+    TIMEOUT = 2  # seconds per command
+
+    def __init__(self, target):
+        import websocket  # websocket-client, installed with Selenium
+
+        self.target_id = target["id"]
+        self._ws = websocket.create_connection(
+            target["webSocketDebuggerUrl"], timeout=self.TIMEOUT, suppress_origin=True
+        )
+        self._ids = itertools.count(1)
+        self._dialog = False
+        self.call("Page.enable")  # Needed for the dialog events
+
+    def dialog_open(self):
+        """Whether a JavaScript dialog is showing, from the events received so far."""
+        import select
+
+        while select.select([self._ws.sock], [], [], 0)[0]:
+            self._event(json.loads(self._ws.recv()))
+        return self._dialog
+
+    def call(self, method, params=None):
+        call_id = next(self._ids)
+        self._ws.send(json.dumps({"id": call_id, "method": method, "params": params or {}}))
+        while True:
+            message = json.loads(self._ws.recv())
+            if message.get("id") == call_id:
+                if "error" in message:
+                    raise RuntimeError(f"{method}: {message['error'].get('message')}")
+                return message.get("result", {})
+            self._event(message)
+
+    def _event(self, message):
+        method = message.get("method")
+        if method == "Page.javascriptDialogOpening":
+            self._dialog = True
+        elif method == "Page.javascriptDialogClosed":
+            self._dialog = False
+
+    def close(self):
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+
+def _damage_box(previous, sample, shape):
+    """
+    Compare two downsampled frames.
+
+    Returns:
+        (left, top, right, bottom) in full-frame pixels covering every changed sample
+        (widened by one sampling step), the whole frame if there is nothing to compare
+        with, or None if nothing changed.
+    """
+    height, width = shape[:2]
+    if previous is None or previous.shape != sample.shape:
+        return 0, 0, width, height
+
+    changed = (previous != sample).any(axis=2)
+    rows = changed.any(axis=1).nonzero()[0]
+    if not rows.size:
+        return None
+    columns = changed.any(axis=0).nonzero()[0]
+    step = CHANGE_SAMPLE_STEP
+    return (
+        max(0, (columns[0] - 1) * step),
+        max(0, (rows[0] - 1) * step),
+        min(width, (columns[-1] + 2) * step),
+        min(height, (rows[-1] + 2) * step),
+    )
+
+
+class Watermark:
+    """
+    Watermark text rendered once as a premultiplied RGB patch covering only the
+    text bounding box, so each frame needs a single integer blend of that region.
+    """
+
+    def __init__(self, text, font_size, text_color, stroke_color, frame_size):
+        """
+        Parameters:
+            text (str): Text to display as a watermark.
+            font_size (int): Font size of the watermark.
+            text_color (tuple): RGBA color for watermark text.
+            stroke_color (tuple): RGBA stroke color for the watermark text.
+            frame_size (tuple): (width, height) of the frames the watermark is applied to.
+        """
+        import numpy as np
+        from PIL import Image, ImageDraw, ImageFont
 
         # Load font for the watermark; fallback to default if unavailable
         try:
@@ -96,42 +940,40 @@ def _record_screen(output_file, watermark_text, font_size, text_color, stroke_co
             font = ImageFont.load_default()
 
         # Calculate position for watermark (centered horizontally, near the bottom)
-        text_position = (width_adjusted // 2 - font_size * len(watermark_text) // 4, height_adjusted - 50)
-
-        while recording:
-            # Capture the current screen
-            img = sct.grab(monitor)
-            frame = Image.frombytes("RGB", img.size, img.rgb)
-
-            # Resize the frame based on the resolution reduction factor
-            frame = frame.resize((width_adjusted, height_adjusted), Image.BICUBIC)
-
-            # Create an overlay for the watermark
-            overlay = Image.new("RGBA", frame.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-            draw.text(
-                text_position,
-                watermark_text,
-                font=font,
-                fill=text_color,
-                stroke_width=2,
-                stroke_fill=stroke_color,
-            )
-
-            # Combine the overlay with the frame
-            frame = Image.alpha_composite(frame.convert("RGBA"), overlay)
+        width, height = frame_size
+        text_position = (width // 2 - font_size * len(text) // 4, height - 50)
 
-            # Convert frame to numpy array for video writer
-            frame_np = np.array(frame.convert("RGB"))
+        layer = Image.new("RGBA", frame_size, (0, 0, 0, 0))
+        ImageDraw.Draw(layer).text(
+            text_position, text, font=font, fill=text_color, stroke_width=2, stroke_fill=stroke_color,
+        )
+        self.box = layer.getbbox()  # (left, top, right, bottom), None if nothing is visible
+        if self.box is None:
+            return
 
-            # Write the frame to the video
-            writer.append_data(frame_np)
+        patch = np.asarray(layer.crop(self.box), dtype=np.uint16)
+        alpha = patch[..., 3:4]
+        self.premultiplied = patch[..., :3] * alpha + 127  # +127 rounds the division below
+        self.inverse_alpha = 255 - alpha
 
-            # Sleep to maintain the desired frame rate
-            time.sleep(1 / fps)
+    def apply(self, frame, source=None):
+        """
+        Blend the watermark into an RGB uint8 frame (H x W x 3 numpy array) in place.
+        With ``source``, the watermark region is blended from ``source`` instead, so a
+        frame that already carries the watermark can be refreshed.
+        """
+        if self.box is None:
+            return frame
+        left, top, right, bottom = self.box
+        region = (source if source is not None else frame)[top:bottom, left:right]
+        frame[top:bottom, left:right] = (self.premultiplied + region * self.inverse_alpha) // 255
+        return frame
 
-        # Finalize the video writer
-        writer.close()
+    def overlaps(self, box):
+        if self.box is None:
+            return False
+        left, top, right, bottom = box
+        return left < self.box[2] and self.box[0] < right and top < self.box[3] and self.box[1] < bottom
 
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+"""
+Request blocking for browser sessions.
+
+Pages pull stylesheets, fonts, images and third-party scripts the bot never reads.
+``RequestBlocker`` refuses them per driver session:
+
+- Chrome and Edge: DevTools ``Network.setBlockedURLs``. Requests, blocked requests,
+  downloaded bytes and page loads (document request to load event) are counted from
+  the browser's performance log.
+- Firefox (no DevTools commands through Selenium): a local proxy that refuses blocked
+  URLs. HTTPS requests only show their host to a proxy, so patterns can only match
+  HTTPS by host, e.g. ``*fonts.gstatic.com*``. A proxy cannot tell when a page has
+  loaded, so Firefox reports no page-load time.
+
+Patterns use ``*`` wildcards and match the whole URL. Resource types are turned into
+URL patterns by file extension.
+"""
+
+import fnmatch
+import http.client
+import json
+import logging
+import select
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+from reusables.browser_profiles import RESOURCE_TYPE_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+
+def patterns_for(url_patterns=(), resource_types=()):
+    """Combine explicit URL patterns and resource types into one de-duplicated pattern list."""
+    patterns = [pattern for pattern in url_patterns if pattern]
+    for resource_type in resource_types:
+        if resource_type not in RESOURCE_TYPE_PATTERNS:
+            raise ValueError(f"Unknown resource type {resource_type!r}, choose from {', '.join(RESOURCE_TYPE_PATTERNS)}")
+        patterns.extend(RESOURCE_TYPE_PATTERNS[resource_type])
+    return list(dict.fromkeys(patterns))
+
+
+class RequestStats:
+    __slots__ = ("requests", "blocked", "bytes", "page_loads", "load_seconds")
+
+    def __init__(self, requests=0, blocked=0, bytes=0, page_loads=0, load_seconds=0.0):
+        self.requests = requests
+        self.blocked = blocked
+        self.bytes = bytes
+        self.page_loads = page_loads
+        self.load_seconds = load_seconds  # from each page's document request to its load event
+
+    def __str__(self):
+        text = f"{self.requests} requests, {self.blocked} blocked, {self.bytes / 1024:.0f} KB downloaded"
+        if self.page_loads:
+            text += f", {self.page_loads} page loads in {self.load_seconds * 1000:.0f} ms"
+        return text
+
+
+class RequestBlocker:
+    def __init__(self, browser, patterns, report=False):
+        """
+        :param browser: "chrome", "edge" or "firefox"
+        :param patterns: URL patterns to refuse (see patterns_for)
+        :param report: count requests even when nothing is blocked, e.g. to measure a baseline
+        """
+        self.browser = browser
+        self.patterns = list(patterns)
+        self.report = report or bool(self.patterns)
+        self.driver = None
+        self._proxy = None
+        self._unreported = None  # counts read as the browser quit
+
+    @property
+    def active(self):
+        return self.report
+
+    def configure_options(self, options):
+        """Prepare the launch options; must run before the browser starts."""
+        if not self.active:
+            return
+        if self.browser in ("chrome", "edge"):
+            # The performance log carries the Network events the counts are taken from
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        elif self.browser == "firefox":
+            self._proxy = BlockingProxy(self.patterns)
+            port = self._proxy.start()
+            options.set_preference("network.proxy.type", 1)
+            for scheme in ("http", "ssl"):
+                options.set_preference(f"network.proxy.{scheme}", "127.0.0.1")
+                options.set_preference(f"network.proxy.{scheme}_port", port)
+            options.set_preference("network.proxy.no_proxies_on", "")
+            options.set_preference("network.proxy.allow_hijacking_localhost", True)
+
+    def attach(self, driver):
+        """
+        Start blocking on a launched driver and make the blocker reachable as ``driver.request_blocker``.
+        ``driver.quit()`` closes the blocker too, so its proxy lives exactly as long as the browser,
+        and first reads the counts the browser still holds, so a failed item that quits its
+        browser is reported all the same.
+        """
+        if not self.active:
+            return
+        self.driver = driver
+        driver.request_blocker = self
+        quit_driver = driver.quit
+
+        def quit_and_close():
+            self._unreported = self._read()
+            self.driver = None
+            try:
+                quit_driver()
+            finally:
+                self.close()
+
+        driver.quit = quit_and_close
+        if self.patterns and hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+
+    def collect(self):
+        """Counts since the previous call (per item when called once per item)."""
+        if self._unreported is not None:
+            stats, self._unreported = self._unreported, None
+            return stats
+        return self._read()
+
+    def _read(self):
+        if self._proxy is not None:
+            return self._proxy.take_stats()
+        if self.driver is None or self.browser not in ("chrome", "edge"):
+            return RequestStats()
+
+        stats = RequestStats()
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            logger.warning("Could not read the performance log: %s", e)
+            return stats
+        loading_since = None  # monotonic timestamp of the page's document request
+        for entry in entries:
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            if method == "Network.requestWillBeSent":
+                stats.requests += 1
+                if message["params"].get("type") == "Document" and loading_since is None:
+                    loading_since = message["params"]["timestamp"]
+            elif method == "Page.loadEventFired" and loading_since is not None:
+                stats.page_loads += 1
+                stats.load_seconds += message["params"]["timestamp"] - loading_since
+                loading_since = None
+            elif method == "Network.loadingFailed" and message["params"].get("blockedReason"):
+                stats.blocked += 1
+            elif method == "Network.loadingFinished":
+                stats.bytes += int(message["params"].get("encodedDataLength", 0))
+        return stats
+
+    def close(self):
+        if self._proxy is not None:
+            self._proxy.stop()
+            self._proxy = None
+
+
+def report_requests(driver, label):
+    """Log the request counts of ``driver`` since the last report, if it has a blocker."""
+    blocker = getattr(driver, "request_blocker", None)
+    if blocker is None:
+        return None
+    stats = blocker.collect()
+    logger.info("Requests for %s: %s", label, stats)
+    return stats
+
+
+class BlockingProxy:
+    """Local HTTP proxy that answers blocked URLs with 403 and tunnels everything else."""
+
+    def __init__(self, patterns):
+        self.patterns = patterns
+        self._stats = RequestStats()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        proxy = self
+
+        class Handler(_ProxyHandler):
+            owner = proxy
+
+        self._server = _ThreadingServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name="blocking-proxy", daemon=True).start()
+        return self._server.server_address[1]
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def is_blocked(self, url):
+        return any(fnmatch.fnmatchcase(url, pattern) for pattern in self.patterns)
+
+    def count(self, blocked=False, size=0):
+        with self._lock:
+            self._stats.requests += 1
+            self._stats.blocked += blocked
+            self._stats.bytes += size
+
+    def add_bytes(self, size):
+        with self._lock:
+            self._stats.bytes += size
+
+    def take_stats(self):
+        with self._lock:
+            stats, self._stats = self._stats, RequestStats()
+        return stats
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    owner = None  # BlockingProxy, set by BlockingProxy.start
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_CONNECT(self):
+        host, _, port = self.path.partition(":")
+        if self.owner.is_blocked(f"https://{host}/") or self.owner.is_blocked(host):
+            self.owner.count(blocked=True)
+            self.send_error(403, "Blocked by request blocker")
+            return
+        self.owner.count()
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=30)
+        except OSError:
+            self.send_error(502)
+            return
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        self._tunnel(upstream)
+
+    def _tunnel(self, upstream):
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, 60)
+                if errored or not readable:
+                    return
+                for source in readable:
+                    data = source.recv(65536)
+                    if not data:
+                        return
+                    (upstream if source is self.connection else self.connection).sendall(data)
+                    if source is upstream:
+                        self.owner.add_bytes(len(data))
+        finally:
+            upstream.close()
+
+    def _forward(self):
+        if self.owner.is_blocked(self.path):
+            self.owner.count(blocked=True)
+            self.send_error(403, "Blocked by request blocker")
+            return
+
+        url = urlsplit(self.path)
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        headers = {key: value for key, value in self.headers.items() if key.lower() != "proxy-connection"}
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+        try:
+            connection.request(self.command, url.path + (f"?{url.query}" if url.query else "") or "/", body, headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except OSError:
+            self.send_error(502)
+            return
+        finally:
+            connection.close()
+
+        self.owner.count(size=len(payload))
+        self.send_response(response.status, response.reason)
+        for key, value in response.getheaders():
+            if key.lower() not in ("transfer-encoding", "connection", "content-length"):
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = do_HEAD = do_OPTIONS = do_PATCH = _forward
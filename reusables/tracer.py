@@ -0,0 +1,201 @@
+"""
+Span tracing for states, page objects and actions.
+
+Spans nest through a context variable, are appended to a JSONL trace file as they
+finish, and the file is converted to the Chrome trace format (chrome://tracing,
+Perfetto) when the tracer is closed. Tracing is off until ``tracer.configure`` is
+called, so instrumented code pays only for a context-variable lookup.
+"""
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+logger = logging.getLogger(__name__)
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_current_state = contextvars.ContextVar("current_state", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """A single timed operation; ``attributes`` may be updated while it is open."""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "attributes", "start_ns", "duration_ns")
+
+    def __init__(self, name, kind, parent_id, attributes):
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.duration_ns = 0
+
+    def to_dict(self):
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_us": self.start_ns // 1000,
+            "duration_us": self.duration_ns // 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attributes": self.attributes,
+        }
+
+
+class Tracer:
+    def __init__(self):
+        self.file_path = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self._file is not None
+
+    def configure(self, directory="../traces"):
+        """Start writing spans to ``<directory>/trace_<timestamp>_<pid>.jsonl``."""
+        os.makedirs(directory, exist_ok=True)
+        current_time = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
+        self.file_path = os.path.join(directory, f"trace_{current_time}_{os.getpid()}.jsonl")
+        self._file = open(self.file_path, "a", encoding="utf-8")
+
+    @contextmanager
+    def span(self, name, kind="internal", **attributes):
+        """
+        Time the enclosed block as a span nested under the current one.
+        The outcome is "ok", or "error" if the block raises, unless set explicitly.
+        """
+        if not self.enabled:
+            yield Span(name, kind, None, attributes)
+            return
+
+        parent = _current_span.get()
+        span = Span(name, kind, parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        started = time.perf_counter_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes.setdefault("outcome", "error")
+            span.attributes.setdefault("error", f"{e.__class__.__name__}: {e}")
+            raise
+        finally:
+            span.duration_ns = time.perf_counter_ns() - started
+            span.attributes.setdefault("outcome", "ok")
+            _current_span.reset(token)
+            self._write(span)
+
+    def _write(self, span):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            if self._file:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self):
+        """Close the JSONL file and write its Chrome trace next to it."""
+        with self._lock:
+            if not self._file:
+                return
+            self._file.close()
+            self._file = None
+        chrome_path = os.path.splitext(self.file_path)[0] + ".chrome.json"
+        export_chrome_trace(self.file_path, chrome_path)
+        logger.info("Trace written to %s and %s", self.file_path, chrome_path)
+
+
+def export_chrome_trace(jsonl_path, output_path):
+    """Convert a JSONL span file into the Chrome trace event format."""
+    events = []
+    with open(jsonl_path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            span = json.loads(line)
+            events.append({
+                "name": span["name"],
+                "cat": span["kind"],
+                "ph": "X",
+                "ts": span["start_us"],
+                "dur": span["duration_us"],
+                "pid": span["pid"],
+                "tid": span["tid"],
+                "args": span["attributes"],
+            })
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def traced(kind, with_label=False):
+    """
+    Decorator to record each call of a method as a span named ``Class.method``.
+    With ``with_label`` the string first argument (the action name) is kept as ``label``;
+    leave it off for methods whose first argument may be a secret such as a password.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not tracer.enabled:
+                return func(self, *args, **kwargs)
+            attributes = {}
+            if with_label:
+                label = args[0] if args and isinstance(args[0], str) else kwargs.get("name")
+                attributes["label"] = label
+            with tracer.span(f"{self.__class__.__name__}.{func.__name__}", kind=kind, **attributes):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def state_span(state, context):
+    """
+    Open a span for one state execution, tagged with the bot and the current item.
+    The bot, item and state stay available to the code it runs through ``current_state``,
+    whether tracing is on or not.
+    """
+    item = (context.variables.get("item") or {}).get("item") or {}
+    info = {"bot_id": context.variables.get("bot_id"), "item_id": item.get("WIID"), "state": state.__class__.__name__}
+    token = _current_state.set(info)
+    try:
+        with tracer.span(info["state"], kind="state", bot_id=info["bot_id"], item_id=info["item_id"]) as span:
+            yield span
+    finally:
+        _current_state.reset(token)
+
+
+def current_state():
+    """{"bot_id", "item_id", "state"} of the state running in this thread or task, {} outside states."""
+    return _current_state.get() or {}
+
+
+def record_state_outcome(span, context, status_before):
+    """
+    Mark a state span failed when the state reported failure instead of raising.
+    ``status_before`` is the item status when the state started; it is per item because
+    PickItem clears the status of the previous item, so consecutive failed items each count.
+    """
+    if span.attributes.get("item_id") is None:
+        item = (context.variables.get("item") or {}).get("item") or {}
+        span.attributes["item_id"] = item.get("WIID")
+    if context.terminate:
+        span.attributes["outcome"] = "terminated"
+    elif context.variables.get("status") == "failed" and status_before != "failed":
+        span.attributes["outcome"] = "failed"
+
+
+tracer = Tracer()
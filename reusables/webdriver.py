@@ -1,3 +1,6 @@
+import logging
+import os
+
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
@@ -5,24 +8,59 @@ from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
+
+from reusables.browser_profiles import get_profile
+from reusables.command_tracer import CommandTracer
+from reusables.driver_cache import DriverCache
+from reusables.request_blocker import RequestBlocker, patterns_for
+
+logger = logging.getLogger(__name__)
+
 
 class WebDriver:
-    def __init__(self, browser="chrome", headless=False, driver_path=None, remote_url=None):
+    def __init__(self, browser="chrome", headless=False, driver_path=None, remote_url=None,
+                 browser_version=None, offline=False, profile="default", cache_key=0,
+                 blocked_urls=(), blocked_resource_types=(), report_requests=False, trace_commands=False):
         """
         Initialize the WebDriver with the specified browser type.
         :param browser: "chrome", "firefox", or "edge"
         :param headless: Run browser in headless mode if True
-        :param driver_path: Path to the WebDriver executable (optional if in PATH)
+        :param driver_path: Path to the WebDriver executable; takes precedence over the driver cache
         :param remote_url: URL of the remote Selenium server (if using RemoteWebDriver)
+        :param browser_version: Installed browser version, selects the cached driver by major version
+        :param offline: Never download a driver; fail if the cache has none
+        :param profile: BrowserProfile or the name of one in browser_profiles.PROFILES
+        :param cache_key: Sub-folder of the profile's disk cache, e.g. the bot id, so
+            concurrent browsers never share one cache
+        :param blocked_urls: URL patterns (``*`` wildcards) this session never loads
+        :param blocked_resource_types: resource types this session never loads, e.g. "image", "font"
+        :param report_requests: count requests per item even if nothing is blocked
+        :param trace_commands: time every WebDriver command, see command_tracer.report_commands
         """
         self.browser = browser.lower()
-        self.headless = headless
+        self.profile = get_profile(profile) if isinstance(profile, str) else profile
+        self.headless = headless or self.profile.headless
+        self.cache_key = cache_key
+        resource_types = list(blocked_resource_types)
+        if self.profile.block_fonts and self.browser != "firefox":
+            resource_types.append("font")  # Firefox blocks fonts through a preference instead
+        self.request_blocker = RequestBlocker(
+            self.browser, patterns_for(blocked_urls, dict.fromkeys(resource_types)), report_requests
+        )
         self.driver_path = driver_path
         self.remote_url = remote_url
-        self.driver = self._initialize_driver()
+        self.browser_version = browser_version
+        self.offline = offline
+        self.trace_commands = trace_commands
+        try:
+            self.driver = self._initialize_driver()
+        except Exception:
+            self.request_blocker.close()  # The Firefox proxy starts before the browser
+            raise
+
+    def _driver_executable(self):
+        """Resolve the driver binary from the explicit path or the local cache."""
+        return DriverCache().resolve(self.browser, self.browser_version, self.driver_path, self.offline)
 
     def _initialize_driver(self):
         """
@@ -31,42 +69,100 @@ class WebDriver:
         """
         # Set up browser options and capabilities
         if self.browser == "chrome":
-
             options = ChromeOptions()
-            if self.headless:
-                options.add_argument("--headless")
+            self._apply_chromium_profile(options)
+            self.request_blocker.configure_options(options)
 
             if self.remote_url:
-                return webdriver.Remote(command_executor=self.remote_url,  options=options)
+                driver = webdriver.Remote(command_executor=self.remote_url,  options=options)
             else:
-                service = ChromeService(ChromeDriverManager().install())
-                return webdriver.Chrome(service=service, options=options)
+                service = ChromeService(self._driver_executable())
+                driver = webdriver.Chrome(service=service, options=options)
 
         elif self.browser == "firefox":
             options = FirefoxOptions()
-            if self.headless:
-                options.add_argument("--headless")
+            self._apply_firefox_profile(options)
+            self.request_blocker.configure_options(options)
 
             if self.remote_url:
-                return webdriver.Remote(command_executor=self.remote_url,  options=options)
+                driver = webdriver.Remote(command_executor=self.remote_url,  options=options)
             else:
-                service = FirefoxService(GeckoDriverManager().install())
-                return webdriver.Firefox(service=service, options=options)
+                service = FirefoxService(self._driver_executable())
+                driver = webdriver.Firefox(service=service, options=options)
 
         elif self.browser == "edge":
             options = EdgeOptions()
-            if self.headless:
-                options.add_argument("--headless")
+            self._apply_chromium_profile(options)
+            self.request_blocker.configure_options(options)
 
             if self.remote_url:
-                return webdriver.Remote(command_executor=self.remote_url, options=options)
+                driver = webdriver.Remote(command_executor=self.remote_url, options=options)
             else:
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                return webdriver.Edge(service=service, options=options)
+                service = EdgeService(self._driver_executable())
+                driver = webdriver.Edge(service=service, options=options)
 
         else:
             raise ValueError("Unsupported browser. Choose from 'chrome', 'firefox', or 'edge'.")
 
+        if self.trace_commands:
+            CommandTracer().attach(driver)
+        try:
+            self.request_blocker.attach(driver)
+        except Exception as e:
+            logger.warning("Could not start request blocking: %s", e)
+        return driver
+
+    def _cache_dir(self):
+        """Per-browser, per-bot folder under the profile's shared disk cache."""
+        if not self.profile.disk_cache_dir:
+            return None
+        path = os.path.abspath(os.path.join(self.profile.disk_cache_dir, self.browser, f"bot{self.cache_key}"))
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def _apply_chromium_profile(self, options):
+        """Chrome and Edge share the Chromium switches."""
+        profile = self.profile
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.page_load_strategy = profile.page_load_strategy
+        if profile.block_images:
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if profile.disable_background_throttling:
+            options.add_argument("--disable-background-timer-throttling")
+            options.add_argument("--disable-backgrounding-occluded-windows")
+            options.add_argument("--disable-renderer-backgrounding")
+        if profile.disable_extensions:
+            options.add_argument("--disable-extensions")
+        if profile.window_size:
+            options.add_argument("--window-size={},{}".format(*profile.window_size))
+        cache_dir = self._cache_dir()
+        if cache_dir:
+            options.add_argument(f"--disk-cache-dir={cache_dir}")
+
+    def _apply_firefox_profile(self, options):
+        profile = self.profile
+        if self.headless:
+            options.add_argument("--headless")
+        options.page_load_strategy = profile.page_load_strategy
+        if profile.block_images:
+            options.set_preference("permissions.default.image", 2)
+        if profile.block_fonts:
+            options.set_preference("gfx.downloadable_fonts.enabled", False)
+            options.set_preference("browser.display.use_document_fonts", 0)
+        if profile.disable_background_throttling:
+            options.set_preference("dom.timeout.enable_budget_timer_throttling", False)
+            options.set_preference("dom.min_background_timeout_value", 0)
+        if profile.disable_extensions:
+            options.set_preference("extensions.enabledScopes", 0)
+        if profile.window_size:
+            options.add_argument(f"--width={profile.window_size[0]}")
+            options.add_argument(f"--height={profile.window_size[1]}")
+        cache_dir = self._cache_dir()
+        if cache_dir:
+            options.set_preference("browser.cache.disk.parent_directory", cache_dir)
+
     def get_driver(self) -> webdriver:
         """
         Return the initialized WebDriver instance.
@@ -78,5 +174,5 @@ class WebDriver:
         Quit the WebDriver instance.
         """
         if self.driver:
-            self.driver.quit()
+            self.driver.quit()  # Also closes the request blocker, see RequestBlocker.attach
 
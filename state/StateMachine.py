@@ -1,3 +1,17 @@
+import logging
+
+from reusables.recorder import mark
+from reusables.tracer import record_state_outcome, state_span
+
+logger = logging.getLogger(__name__)
+
+
+def mark_state(state, context):
+    """Note the state and item a bot enters in the recording index."""
+    item = (context.variables.get("item") or {}).get("item") or {}
+    mark(bot_id=context.variables.get("bot_id"), item_id=item.get("WIID"), state=state.__class__.__name__)
+
+
 class State:
     """Abstract base class for states."""
 
@@ -13,18 +27,27 @@ class State:
 class StateMachine:
     """State Machine to execute states sequentially."""
 
-    def __init__(self, initial_state, context):
+    def __init__(self, initial_state, context, checkpoint=None):
         if not initial_state or not hasattr(initial_state, "execute"):
             raise ValueError("Initial state must implement the 'execute' method.")
         self.current_state = initial_state
         self.context = context
+        self.checkpoint = checkpoint  # Optional journal written at every transition
 
     def run(self):
         """Run the state machine until termination or no next state."""
         try:
             while self.current_state and not self.context.terminate:
-                self.current_state.execute(self.context)
+                status_before = self.context.variables.get("status")
+                mark_state(self.current_state, self.context)
+                with state_span(self.current_state, self.context) as span:
+                    self.current_state.execute(self.context)
+                    record_state_outcome(span, self.context, status_before)
                 self.current_state = self.current_state.next_state(self.context)
+                if self.checkpoint:
+                    self.checkpoint.save(self.context, self.current_state)
+            if self.checkpoint and not self.context.variables.get("item"):
+                self.checkpoint.clear()
         except Exception as e:
-            print(f"StateMachine encountered an error: {e}")
+            logger.error("StateMachine encountered an error: %s", e)
 
@@ -0,0 +1,72 @@
+import asyncio
+import contextvars
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from reusables.tracer import record_state_outcome, state_span
+from state.StateMachine import mark_state
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncStateMachine:
+    """
+    State Machine to execute states sequentially on an asyncio event loop.
+
+    States may implement ``execute``/``next_state`` as coroutines. Plain blocking
+    methods (WebDriver calls, queue file access) are sent to a bounded executor,
+    so several machines can share one event loop without blocking each other.
+    """
+
+    def __init__(self, initial_state, context, executor=None, checkpoint=None):
+        if not initial_state or not hasattr(initial_state, "execute"):
+            raise ValueError("Initial state must implement the 'execute' method.")
+        self.current_state = initial_state
+        self.context = context
+        self.executor = executor
+        self.checkpoint = checkpoint  # Optional journal written at every transition
+
+    async def _call(self, method):
+        """Await a coroutine method, or run a blocking one in the executor."""
+        if inspect.iscoroutinefunction(method):
+            return await method(self.context)
+        loop = asyncio.get_running_loop()
+        # Carry the context variables (e.g. the open trace span) into the worker thread
+        call_context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, call_context.run, method, self.context)
+
+    async def run(self):
+        """Run the state machine until termination or no next state."""
+        try:
+            while self.current_state and not self.context.terminate:
+                status_before = self.context.variables.get("status")
+                mark_state(self.current_state, self.context)
+                with state_span(self.current_state, self.context) as span:
+                    await self._call(self.current_state.execute)
+                    record_state_outcome(span, self.context, status_before)
+                self.current_state = await self._call(self.current_state.next_state)
+                if self.checkpoint:
+                    await asyncio.get_running_loop().run_in_executor(
+                        self.executor, self.checkpoint.save, self.context, self.current_state
+                    )
+            if self.checkpoint and not self.context.variables.get("item"):
+                self.checkpoint.clear()
+        except Exception as e:
+            logger.error("AsyncStateMachine encountered an error: %s", e)
+
+
+async def run_concurrently(machines, max_workers=None):
+    """
+    Run several state machines concurrently on the current event loop.
+
+    :param machines: list of AsyncStateMachine instances, one per context
+    :param max_workers: size of the executor shared for blocking calls (default: one per machine)
+    """
+    if not machines:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers or len(machines),
+                            thread_name_prefix="state-worker") as executor:
+        for machine in machines:
+            machine.executor = executor
+        await asyncio.gather(*(machine.run() for machine in machines))
@@ -0,0 +1,99 @@
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+# Context variables that survive a restart; the driver and config are rebuilt on start
+CHECKPOINT_VARIABLES = ("item", "client_data", "hashed_data", "status")
+
+
+class Checkpoint:
+    """
+    Journal of the serializable part of a bot's context.
+
+    The journal is rewritten atomically at every state transition, so after a crash
+    the bot can continue the claimed item from the last finished state instead of
+    leaving it locked and redoing the browser work.
+    """
+
+    def __init__(self, bot_id=0, directory="../checkpoints"):
+        self.bot_id = bot_id
+        self.directory = directory
+        self.file_path = os.path.join(directory, f"bot_{bot_id}.json")
+
+    def save(self, context, next_state):
+        """Write the item variables and the name of the next state to the journal."""
+        if context.variables.get("resume_state"):
+            return  # Keep the restored record until the item is actually resumed
+        record = {
+            "bot_id": self.bot_id,
+            "state": type(next_state).__name__ if next_state else None,
+            "variables": {key: context.variables.get(key) for key in CHECKPOINT_VARIABLES},
+        }
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f"bot_{self.bot_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(record, file, default=str)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.file_path)
+        except Exception:
+            os.remove(temp_path)
+            raise
+
+    def load(self):
+        """Return the last journal record, or None if there is nothing to resume."""
+        try:
+            with open(self.file_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %s", self.file_path, e)
+            return None
+
+    def clear(self):
+        """Remove the journal once the bot has finished cleanly."""
+        try:
+            os.remove(self.file_path)
+        except FileNotFoundError:
+            pass
+
+    def restore(self, context):
+        """
+        Load the journal into the context and choose the state to resume with.
+        The chosen state is run right after login instead of picking a new item.
+        :return: True if an in-flight item was restored
+        """
+        record = self.load()
+        if not record or not record["variables"].get("item"):
+            return False
+
+        resume_state = self._resume_state(record["state"], record["variables"])
+        if resume_state is None:
+            return False
+
+        for key, value in record["variables"].items():
+            if value is not None:
+                context.variables[key] = value
+        context.variables["resume_state"] = resume_state
+        logger.info("Resuming item %s at %s.", record["variables"]["item"]["item"].get("WIID"), record["state"])
+        return True
+
+    @staticmethod
+    def _resume_state(state_name, variables):
+        """Map a journaled state name to the state that continues the item."""
+        if state_name == "WorkItemData":
+            from state.workItemData import WorkItemData
+            return WorkItemData()
+        if state_name in ("HashData", "UpdateWorkItem") and variables.get("status") != "failed":
+            # The update page lived in the crashed browser, so it has to be reopened first
+            from state.resumeItem import ResumeItem
+            return ResumeItem()
+        if state_name == "PickItem" and variables.get("status"):
+            from state.pickItem import PickItem
+            return PickItem()
+        return None
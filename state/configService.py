@@ -0,0 +1,99 @@
+import logging
+import os
+import threading
+
+from library.config import Config
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = "../data/Config.xlsx"
+
+
+class ConfigService:
+    """
+    Publishes Config.xlsx as versioned, typed snapshots and reloads it when the file changes.
+
+    The file is watched by polling its mtime, which works on any file system. A reload
+    only decrypts credentials again if they changed, and an edit that fails validation
+    keeps the last good snapshot. States pick up a new snapshot at the start of the next
+    item through ``refresh``; process-wide settings are applied by ``subscribe`` callbacks.
+    """
+
+    def __init__(self, file_path=CONFIG_PATH, poll_interval=5):
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self.snapshot = None
+        self._mtime_ns = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Load the first snapshot and start watching the file (once per process)."""
+        with self._lock:
+            if self.snapshot is None:
+                self._reload()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, name="config-watcher", daemon=True)
+                self._thread.start()
+        return self.snapshot
+
+    def stop(self):
+        self._stop.set()
+
+    def subscribe(self, callback):
+        """Call ``callback(config, changed_fields)`` after every published snapshot."""
+        self._subscribers.append(callback)
+
+    def reload(self):
+        """Re-read the file now and publish a new snapshot if anything changed."""
+        with self._lock:
+            return self._reload()
+
+    def _reload(self):
+        from state.initializeVariable import StaticVariable
+
+        self._mtime_ns = os.stat(self.file_path).st_mtime_ns
+        StaticVariable.load(self.file_path)
+        previous = self.snapshot
+        snapshot = Config.from_variables(
+            (previous.version + 1) if previous else 1,
+            StaticVariable.dict_int,
+            StaticVariable.dict_string,
+            StaticVariable.dict_bool,
+            StaticVariable.decrypted_credentials,
+        )
+        changed = snapshot.changed_fields(previous)
+        if previous and not changed:
+            return previous
+
+        self.snapshot = snapshot
+        if previous:
+            logger.info("Config reloaded (version %s), changed: %s", snapshot.version, ", ".join(sorted(changed)))
+        for callback in self._subscribers:
+            try:
+                callback(snapshot, changed)
+            except Exception as e:
+                logger.error("Error in config subscriber: %s", e)
+        return snapshot
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if os.stat(self.file_path).st_mtime_ns != self._mtime_ns:
+                    self.reload()
+            except Exception as e:
+                logger.error("Config reload failed, keeping version %s: %s", self.snapshot.version, e)
+
+    def refresh(self, context):
+        """Copy the latest snapshot into the context if it is newer than the one it holds."""
+        snapshot = self.snapshot
+        if snapshot is None or context.variables.get("config_version") == snapshot.version:
+            return False
+        context.variables["config_version"] = snapshot.version
+        context.variables["config"] = snapshot
+        return True
+
+
+config_service = ConfigService()
@@ -1,6 +1,11 @@
+import logging
+
 from StateMachine import State
 from sub_process.hash_data import hash_data_init
 from reusables.custom_exception import CustomException
+from reusables.recorder import stop_recording
+
+logger = logging.getLogger(__name__)
 
 
 class HashData(State):
@@ -9,7 +14,7 @@ class HashData(State):
     def execute(self, context):
         """Executes the data hashing process."""
         try:
-            print("Executing HashData State...")
+            logger.info("Executing HashData State...")
             driver = context.variables["driver"]
             client_data = context.variables.get("client_data")
 
@@ -19,24 +24,26 @@ class HashData(State):
             hashed_data = hash_data_init(driver, client_data)
             context.variables["hashed_data"] = hashed_data
 
-            print("Hashed data:", hashed_data)
+            logger.info("Hashed data: %s", hashed_data)
             driver.back()  # Navigate back after processing the hash
 
         except (CustomException, Exception) as e:
-            print(f"Error in HashData.execute: {e}")
+            logger.error("Error in HashData.execute: %s", e)
             # context.terminate = True
             context.variables["status"] = "failed"
 
     def next_state(self, context):
         """Determines the next state based on the result of the hashing process."""
         if context.variables.get("hashed_data"):
-            print("Hashed data found, proceeding to UpdateWorkItem state.")
+            logger.info("Hashed data found, proceeding to UpdateWorkItem state.")
             from state.updateWorkItem import UpdateWorkItem
             return UpdateWorkItem()
         else:
-            print("No hashed data found, terminating process.")
-            context.variables["driver"].quit()
+            logger.warning("No hashed data found, terminating process.")
             context.variables["status"] = "failed"
+            # A browser recording ends with its browser, so save the failure clip now
+            stop_recording(context.variables.get("bot_id"), failure_tag=context.variables["item"]["item"].get("WIID"))
+            context.variables["driver"].quit()
             # return to pick item to update the status of item it xlsx file
             from state.pickItem import PickItem
             return PickItem()
@@ -1,7 +1,10 @@
+import logging
+
 from state.StateMachine import State
 from reusables.browser_detection import BrowserDetection
 from reusables.recorder import start_recording, stop_recording
-from reusables.webdriver import WebDriver
+
+logger = logging.getLogger(__name__)
 
 
 class InitializeApp(State):
@@ -10,22 +13,27 @@ class InitializeApp(State):
     def execute(self, context):
         """Perform initialization tasks."""
         try:
-            print("Executing InitializeApp State...")
+            logger.info("Executing InitializeApp State...")
 
-            # Check and start recording if enabled
-            is_record = context.variables.get("dict_bool", {}).get("IsRecord", {}).get("value", False)
-            self._check_recording(is_record)
+            # Check and start screen recording if enabled
+            config = context.variables["config"]
+            self._check_recording(config)
 
             # Detect browser and OS details
-            os_name, browser_name, browser_version = BrowserDetection().get_os_browser_version()
+            os_name, browser_name, browser_version = BrowserDetection(
+                config.browser, config.browser_version
+            ).get_os_browser_version()
 
             # Initialize WebDriver
-            driver = self._get_driver(browser_name)
+            driver = self._get_driver(config, browser_name, browser_version, context.variables.get("bot_id", 0))
             context.variables["driver"] = driver
 
+            # Browser recordings need the driver
+            self._check_recording(config, driver=driver, bot_id=context.variables.get("bot_id"))
+
         except Exception as e:
-            print(f"Error in InitializeApp.execute: {e}")
-            stop_recording()
+            logger.error("Error in InitializeApp.execute: %s", e)
+            stop_recording(context.variables.get("bot_id"))  # Other bots and the screen keep recording
             context.terminate = True  # Gracefully terminate on error
 
     def next_state(self, context):
@@ -34,18 +42,36 @@ class InitializeApp(State):
         return Login()
 
     @staticmethod
-    def _get_driver(browser_name):
+    def _get_driver(config, browser_name, browser_version=None, bot_id=0):
         """Get a WebDriver instance for the given browser."""
+        from reusables.webdriver import WebDriver  # selenium is only loaded once a browser is needed
+
         try:
-            return WebDriver(browser=browser_name, headless=False).get_driver()
+            return WebDriver(
+                browser=browser_name,
+                profile=config.browser_profile,
+                cache_key=bot_id,
+                driver_path=config.driver_path or None,
+                browser_version=browser_version,
+                offline=config.driver_offline,
+                blocked_urls=config.blocked_url_list,
+                blocked_resource_types=config.blocked_resource_type_list,
+                report_requests=config.report_requests,
+                trace_commands=config.trace_commands,
+            ).get_driver()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize WebDriver: {e}")
 
     @staticmethod
-    def _check_recording(is_record):
-        """Start screen recording if enabled."""
-        print(f"Screen recording enabled: {is_record}")
-        if is_record:
+    def _check_recording(config, driver=None, bot_id=None):
+        """
+        Start recording if enabled: the screen when called without a driver, the
+        browser of ``driver`` when RecordSource is browser.
+        """
+        if (driver is None) != (config.record_source == "screen"):
+            return
+        logger.info("Recording enabled: %s (%s, %s)", config.is_record, config.record_mode, config.record_source)
+        if config.is_record:
             try:
                 start_recording(
                     output_file_prefix="../Records/output",
@@ -53,7 +79,16 @@ class InitializeApp(State):
                     font_size=30,
                     text_color=(255, 255, 255, 128),
                     stroke_color=(0, 0, 0, 255),
-                    fps=30,
+                    # A browser screenshot costs a DevTools round trip, so browsers are sampled less often
+                    fps=30 if driver is None else 10,
+                    mode=config.record_mode,
+                    buffer_seconds=config.record_buffer_seconds,
+                    buffer_mb=config.record_buffer_mb,
+                    segment_seconds=config.record_segment_seconds,
+                    segment_mb=config.record_segment_mb,
+                    keep_segments=config.record_keep_segments,
+                    driver=driver,
+                    bot_id=bot_id,
                 )
             except Exception as e:
                 raise RuntimeError(f"Failed to start recording: {e}")
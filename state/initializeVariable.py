@@ -1,4 +1,12 @@
+import logging
+
 from state.StateMachine import State
+from library.config import apply_config
+from state.configService import CONFIG_PATH, config_service
+from reusables.artifact_store import artifact_store
+from reusables.circuit_breaker import circuit_breaker
+
+logger = logging.getLogger(__name__)
 
 
 class InitializeVariable(State):
@@ -7,15 +15,12 @@ class InitializeVariable(State):
     def execute(self, context):
         """Initialize shared variables."""
         try:
-            static_variable = StaticVariable()
-            print("Executing InitializeVariable State...")
-            context.variables["bot_id"] = 0
-            context.variables["dict_bool"] = static_variable.dict_bool
-            context.variables["credentials"] = static_variable.decrypted_credentials
-            context.variables["dict_int"] = static_variable.dict_int
-            context.variables["dict_string"] = static_variable.dict_string
+            logger.info("Executing InitializeVariable State...")
+            context.variables.setdefault("bot_id", 0)
+            config_service.start()
+            config_service.refresh(context)
         except Exception as e:
-            print(f"Error in InitializeVariable.execute: {e}")
+            logger.error("Error in InitializeVariable.execute: %s", e)
             context.terminate = True  # Terminate the state machine on error
 
     def next_state(self, context):
@@ -24,8 +29,36 @@ class InitializeVariable(State):
         return InitializeApp()
 
 
-import pandas as pd
-from reusables.aes_handler import AESHandler
+def apply_process_config(config, changed):
+    """Apply the settings that belong to the process rather than to one bot."""
+    apply_config(config)
+    circuit_breaker.configure(
+        failure_threshold=config.breaker_threshold,
+        probe_interval=config.breaker_probe_interval,
+    )
+    config_service.poll_interval = config.config_poll_interval
+    artifact_store.max_artifacts = config.artifact_retention
+
+    # Restart the recorder when its settings are changed while the bots are running
+    if config.version > 1 and any(name.startswith("record") or name == "is_record" for name in changed):
+        from state.initializeApp import InitializeApp
+        from reusables.recorder import recording_drivers, stop_recording
+
+        drivers = recording_drivers()
+        stop_recording()
+        InitializeApp._check_recording(config)
+        # Browser recordings restart on the drivers they had; new bots pick up the setting in InitializeApp
+        for bot_id, driver in drivers.items():
+            InitializeApp._check_recording(config, driver=driver, bot_id=bot_id)
+
+
+config_service.subscribe(apply_process_config)
+
+
+from reusables.config_cache import (
+    load_cached_config, load_unchanged_sheets, merge_sheets, save_cached_config, sheet_fingerprints,
+)
+from reusables.credential_vault import CredentialVault
 
 
 class StaticVariable:
@@ -34,6 +67,7 @@ class StaticVariable:
     dict_string = None
     dict_bool = None
     decrypted_credentials = None
+    _encrypted_credentials = None
 
     def __init__(self):
         self.initialize_variable()
@@ -42,18 +76,46 @@ class StaticVariable:
     def initialize_variable(cls):
         if not cls._initialized:
             """Static method to initialize variables and return shared dictionaries."""
-            raw_data = cls._read_variables_from_xlsx()
-            cls.dict_int, cls.dict_string, cls.dict_bool, dict_credentials = cls._initialize_variables_from_xlsx(
-                raw_data
-            )
+            cls.load()
+
+    @classmethod
+    def load(cls, file_path=CONFIG_PATH):
+        """(Re)loads the variables; credentials are decrypted again only if they changed."""
+        dict_int, dict_string, dict_bool, dict_credentials = cls._load_variables(file_path)
+        vault = CredentialVault()
+        if vault.exists():
+            # The vault replaces the Cred sheet; it keeps its own cache of decrypted records
+            cls.decrypted_credentials = vault.load()
+        elif dict_credentials != cls._encrypted_credentials:
             cls.decrypted_credentials = cls._decrypt_credentials(dict_credentials)
-            cls._initialized = True
+            cls._encrypted_credentials = dict_credentials
+        cls.dict_int, cls.dict_string, cls.dict_bool = dict_int, dict_string, dict_bool
+        cls._initialized = True
+
+    @classmethod
+    def _load_variables(cls, file_path=CONFIG_PATH):
+        """
+        Loads the variables from the compiled cache. When the xlsx file changed, only
+        the sheets whose cells changed are parsed again.
+        """
+        cached = load_cached_config(file_path)
+        if cached:
+            return cached
+        fingerprints = sheet_fingerprints(file_path)
+        sheets = load_unchanged_sheets(file_path, fingerprints)
+        stale = None if fingerprints is None else [name for name in fingerprints if name not in sheets]
+        if stale is None or stale:
+            sheets.update(cls._variables_by_sheet(cls._read_variables_from_xlsx(file_path, stale)))
+        save_cached_config(file_path, sheets, fingerprints)
+        return merge_sheets(sheets)
 
     @staticmethod
-    def _read_variables_from_xlsx(file_path="../data/Config.xlsx"):
-        """Reads data from an Excel file."""
+    def _read_variables_from_xlsx(file_path=CONFIG_PATH, sheet_names=None):
+        """Reads the given sheets (all by default) from an Excel file."""
+        import pandas as pd
+
         excel_data = pd.ExcelFile(file_path)
-        return {sheet: excel_data.parse(sheet) for sheet in excel_data.sheet_names}
+        return {sheet: excel_data.parse(sheet) for sheet in sheet_names or excel_data.sheet_names}
 
     @staticmethod
     def _check_for_duplicates(data, sheet_name):
@@ -68,12 +130,13 @@ class StaticVariable:
                 )
 
     @classmethod
-    def _initialize_variables_from_xlsx(cls, data):
-        """Processes Excel data into structured dictionaries."""
-        dict_int, dict_string, dict_bool, dict_credentials = {}, {}, {}, {}
+    def _variables_by_sheet(cls, data):
+        """Processes Excel sheets into structured dictionaries, per sheet (see merge_sheets)."""
+        sheets = {name: {} for name in data}
 
         # Check for duplicates in each relevant sheet
         if "Constants" in data:
+            dict_int, dict_string, dict_bool = {}, {}, {}
             cls._check_for_duplicates(data, "Constants")
             for _, row in data["Constants"].iterrows():
                 variable_name, value, var_type = row["VariableName"], row["Value"], row["Type"]
@@ -83,18 +146,23 @@ class StaticVariable:
                     dict_string[variable_name] = {"value": value, "type": var_type}
                 elif "bool" in var_type:
                     dict_bool[variable_name] = {"value": value, "type": var_type}
+            sheets["Constants"] = {"int": dict_int, "string": dict_string, "bool": dict_bool}
 
         if "Cred" in data:
+            dict_credentials = {}
             cls._check_for_duplicates(data, "Cred")
             for _, row in data["Cred"].iterrows():
                 variable, username, password = row["VariableName"], row["Username"], row["Password"]
                 dict_credentials[variable] = {"username": username, "password": password}
+            sheets["Cred"] = {"credentials": dict_credentials}
 
-        return dict_int, dict_string, dict_bool, dict_credentials
+        return sheets
 
     @staticmethod
     def _decrypt_credentials(credentials):
-        """Decrypts credentials using AESHandler."""
+        """Decrypts the legacy Cred sheet credentials using AESHandler."""
+        from reusables.aes_handler import AESHandler
+
         key = b"put your key that you use to encrypt here"
         iv = b'put your iv that you use to encrypt here'
         aes = AESHandler(key=key, iv=iv)
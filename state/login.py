@@ -1,7 +1,12 @@
+import logging
+
 from reusables.custom_exception import CustomException
+from reusables.recorder import stop_recording
 from state.StateMachine import State
 from sub_process.login_acme import login_init
 
+logger = logging.getLogger(__name__)
+
 
 class Login(State):
     """State to perform login operations."""
@@ -9,33 +14,32 @@ class Login(State):
     def execute(self, context):
         """Execute login using provided credentials."""
         try:
-            print("Executing Login State...")
-
-            # Retrieve login credentials
-            credentials = context.variables.get("credentials", {}).get("login_credentials", {})
-            if not credentials:
-                raise ValueError("Login credentials are missing from the context variables.")
+            logger.info("Executing Login State...")
 
-            user_name = credentials.get("username")
-            password = credentials.get("password")
-            if not user_name or not password:
-                raise ValueError("Username or password is missing in the login credentials.")
+            # Retrieve login credentials (validated when the config was loaded)
+            credentials = context.variables["config"].login_credentials
+            user_name = credentials.username
+            password = credentials.password
 
-            print(f"Attempting to log in with username: {user_name}")
+            logger.info("Attempting to log in with username: %s", user_name)
 
             # Perform the login operation
             login_success = login_init(context.variables["driver"], user_name, password)
 
             if not login_success:
                 raise RuntimeError("Login failed. Please check the credentials or driver.")
-            print("Login successful.")
+            logger.info("Login successful.")
 
         except (CustomException, Exception) as e:
-            print(f"Error in Login by selenium library: {e}")
+            logger.error("Error in Login by selenium library: %s", e)
+            stop_recording(context.variables.get("bot_id"))  # A browser recording ends with its browser
             context.variables["driver"].quit()
             context.terminate = True
 
     def next_state(self, context):
-        """Proceed to the PickItem state."""
+        """Proceed to the PickItem state, or continue an item restored from a checkpoint."""
+        resume_state = context.variables.pop("resume_state", None)
+        if resume_state:
+            return resume_state
         from state.pickItem import PickItem
         return PickItem()
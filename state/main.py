@@ -1,18 +1,100 @@
 from StateMachine import StateMachine
 from context import Context
+from state.checkpoint import Checkpoint
 from state.initializeVariable import InitializeVariable
+from reusables.artifact_store import artifact_store
 from reusables.recorder import stop_recording
+from reusables.tracer import tracer
 
+import argparse
+import logging
 import sys
 
-if __name__ == "__main__":
-    # Initialize the context and state machine
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Calculate client security hash for ACME work items.")
+    parser.add_argument(
+        "--pipeline", type=int, default=0, metavar="DEPTH",
+        help="overlap item stages over DEPTH browser sessions instead of running them one by one",
+    )
+    parser.add_argument(
+        "--bots", type=int, default=0, metavar="N",
+        help="run N bots concurrently on one event loop, each with its own browser session",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help="maximum threads for blocking driver and file calls when using --bots (default: one per bot)",
+    )
+    parser.add_argument(
+        "--no-resume", action="store_true",
+        help="ignore the checkpoint journal and start with a new item",
+    )
+    parser.add_argument(
+        "--trace", nargs="?", const="../traces", default=None, metavar="DIR",
+        help="write per-state, page-object and action spans as JSONL and Chrome trace files to DIR",
+    )
+    return parser.parse_args()
+
+
+def run_pipeline(depth):
+    """Initialize the shared variables and run the pipelined state machine."""
+    from state.pipelineStateMachine import PipelinedStateMachine
+
     context = Context()
-    initial_state = InitializeVariable()
-    state_machine = StateMachine(initial_state, context)
+    InitializeVariable().execute(context)
+    if not context.terminate:
+        PipelinedStateMachine(context, depth=depth).run()
+
+
+def new_checkpoint(context, bot_id, resume):
+    """Create the bot's checkpoint journal and restore its in-flight item into the context."""
+    checkpoint = Checkpoint(bot_id=bot_id)
+    if resume:
+        checkpoint.restore(context)
+    return checkpoint
+
+
+def run_bots(bots, workers, resume=True):
+    """Run several independent bots concurrently on one event loop."""
+    import asyncio
+    from state.asyncStateMachine import AsyncStateMachine, run_concurrently
+
+    machines = []
+    for bot in range(bots):
+        context = Context()
+        # Lock values must be truthy, a lock of 0 reads as unlocked in the queue file
+        context.variables["bot_id"] = bot + 1
+        checkpoint = new_checkpoint(context, bot + 1, resume)
+        machines.append(AsyncStateMachine(InitializeVariable(), context, checkpoint=checkpoint))
+    asyncio.run(run_concurrently(machines, max_workers=workers))
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    # Configured here rather than at import, so importing this module stays cheap
+    from reusables import logging_config
+
+    logging_config.setup()
+    if args.trace:
+        tracer.configure(args.trace)
+
+    if args.pipeline:
+        run_pipeline(args.pipeline)
+    elif args.bots:
+        run_bots(args.bots, args.workers, resume=not args.no_resume)
+    else:
+        # Initialize the context and state machine, resuming an interrupted item if any
+        context = Context()
+        checkpoint = new_checkpoint(context, 0, resume=not args.no_resume)
+        initial_state = InitializeVariable()
+        state_machine = StateMachine(initial_state, context, checkpoint=checkpoint)
 
-    # Run the state machine
-    state_machine.run()
-    print("State machine execution completed.")
+        # Run the state machine
+        state_machine.run()
+    logger.info("State machine execution completed.")
     stop_recording()
+    artifact_store.flush()
+    tracer.close()
     sys.exit(0)
@@ -1,8 +1,18 @@
+import logging
+
 from StateMachine import State
+from state.configService import config_service
+from reusables.circuit_breaker import circuit_breaker
 from reusables.custom_exception import CustomException
+from reusables.recorder import save_failure_clip, stop_recording
 
 from sub_process.pick_item import get_item, update_item, check_item_bot
 
+logger = logging.getLogger(__name__)
+
+# Per-item keys that must not leak from one item into the next on a reused session
+ITEM_VARIABLES = ("item", "client_data", "hashed_data", "status", "is_update")
+
 
 class PickItem(State):
     """State to pick and process an item."""
@@ -10,40 +20,24 @@ class PickItem(State):
     def execute(self, context):
         """Executes item picking, updates its status, and recycles if needed."""
         try:
-            print("Executing PickItem State...")
-            status = context.variables.get("status", None)
-
-            # If item was updated, update the status and check for the next item
-            if status == "success":
-                print("Item updated.")
-                self._update_item_status(context, {"_status": "success", "Status": "Complete", "lock": False})
-                # Check again for a new item after the update
-                self._pick_new_item(context)
-            elif status == "failed":
-                print("Item update failed.")
-                __item = context.variables.get("item")
-                __item = __item["item"]
-                self._update_item_status(context,
-                                         {"_status": "fail",
-                                          "retry_number": __item["retry_number"] + 1, "lock": False})
-                # Check again for a new item after the update
-                self._pick_new_item(context)
-            else:
-                # If no item was updated, pick a new one
-                self._pick_new_item(context)
+            logger.info("Executing PickItem State...")
+            # Report the outcome of the previous item, then check for the next item
+            self._report_item_status(context)
+            self._pick_new_item(context)
 
         except (CustomException, Exception) as e:
-            print(f"Error in PickItem.execute: {e}")
+            logger.error("Error in PickItem.execute: %s", e)
             context.terminate = True
 
     def next_state(self, context):
         """Determines the next state based on item availability."""
         if context.variables.get("item"):
-            print("Item found, proceeding to WorkItemData state.")
+            logger.info("Item found, proceeding to WorkItemData state.")
             from state.workItemData import WorkItemData
             return WorkItemData()
         else:
-            print("No item found, terminating process.")
+            logger.info("No item found, terminating process.")
+            stop_recording(context.variables.get("bot_id"))  # A browser recording ends with its browser
             context.variables["driver"].quit()
             context.terminate = True
             return None
@@ -51,17 +45,61 @@ class PickItem(State):
     @staticmethod
     def _pick_new_item(context):
         """Retrieves a new item and updates context variables."""
+        # A failed previous item would otherwise block resuming this one and hide its failures in traces
+        for key in ITEM_VARIABLES:
+            context.variables.pop(key, None)
+        # Do not claim items while the target sites are down
+        circuit_breaker.wait_until_closed(context)
+        if context.terminate:
+            return
+        # Each item runs with the latest published config
+        config_service.refresh(context)
         bot_id = context.variables["bot_id"]
         item, row_idx = get_item(bot_id)
 
         if item:
             if check_item_bot(bot_id, row_idx):
-                print(f"Item picked: {item}")
+                logger.info("Item picked: %s", item)
                 context.variables["item"] = {"item": item, "row_idx": row_idx}
             else:
                 PickItem._pick_new_item(context)
         else:
-            print("No suitable item found.")
+            logger.info("No suitable item found.")
+
+    @staticmethod
+    def _report_item_status(context):
+        """Writes the outcome of the current item back to the queue file."""
+        status = context.variables.get("status", None)
+
+        item = context.variables.get("item")
+        if item:
+            # Loaded with the browser, not at start-up
+            from reusables.command_tracer import report_commands
+            from reusables.request_blocker import report_requests
+
+            label = f"item {item['item'].get('WIID')}"
+            report_requests(context.variables.get("driver"), label)
+            report_commands(context.variables.get("driver"), label)
+
+        if status == "failed":
+            # Keep the seconds leading up to the failure before anything else happens on screen
+            item = context.variables.get("item") or {}
+            save_failure_clip((item.get("item") or {}).get("WIID", "unknown"), context.variables.get("bot_id"))
+
+        if status == "success":
+            logger.info("Item updated.")
+            circuit_breaker.record_success()
+            PickItem._update_item_status(context, {"_status": "success", "Status": "Complete", "lock": False})
+        elif status == "failed" and circuit_breaker.record_failure():
+            logger.warning("Item failed while the target sites were down, releasing it without a retry.")
+            PickItem._update_item_status(context, {"lock": False})
+        elif status == "failed":
+            logger.warning("Item update failed.")
+            __item = context.variables.get("item")
+            __item = __item["item"]
+            PickItem._update_item_status(context,
+                                         {"_status": "fail",
+                                          "retry_number": __item["retry_number"] + 1, "lock": False})
 
     @staticmethod
     def check_item_bot(bot_id):
@@ -0,0 +1,154 @@
+import logging
+import queue
+import threading
+
+from state.context import Context
+from state.hashData import HashData
+from state.initializeApp import InitializeApp
+from state.login import Login
+from state.pickItem import PickItem
+from state.StateMachine import mark_state
+from state.updateWorkItem import UpdateWorkItem
+from state.workItemData import WorkItemData
+from reusables.browser_detection import BrowserDetection
+from reusables.recorder import stop_recording
+from reusables.tracer import record_state_outcome, state_span
+
+logger = logging.getLogger(__name__)
+
+
+class PipelinedStateMachine:
+    """
+    Run the item states as a two-stage pipeline over several browser sessions.
+
+    The front stage claims an item and reads its client data (PickItem, WorkItemData),
+    the back stage hashes it and confirms the update (HashData, UpdateWorkItem).
+    Each session (lane) carries one item at a time, so while the back stage confirms
+    item i on one lane, the front stage is already reading item i+1 on another.
+    The number of lanes bounds the number of items in flight.
+    """
+
+    def __init__(self, context, depth=2):
+        """
+        :param context: base context holding the variables from InitializeVariable
+        :param depth: number of browser sessions, i.e. the maximum items in flight
+        """
+        if depth < 1:
+            raise ValueError("Pipeline depth must be at least 1.")
+        self.context = context
+        self.depth = depth
+        self.lanes = []
+        self._idle = queue.Queue()
+        self._ready = queue.Queue(maxsize=depth)
+
+    def run(self):
+        """Run both stages until the queue is exhausted or the context is stopped."""
+        try:
+            self._open_lanes()
+            front = threading.Thread(target=self._front_stage, name="pipeline-front", daemon=True)
+            front.start()
+            self._back_stage()
+            front.join()
+        except Exception as e:
+            logger.error("PipelinedStateMachine encountered an error: %s", e)
+        finally:
+            self._close_lanes()
+
+    def _open_lanes(self):
+        """Start and log in one browser session per lane."""
+        config = self.context.variables["config"]
+        InitializeApp._check_recording(config)
+        os_name, browser_name, browser_version = BrowserDetection(
+            config.browser, config.browser_version
+        ).get_os_browser_version()
+
+        for lane in range(self.depth):
+            lane_context = Context()
+            lane_context.variables.update(self.context.variables)
+            # Lock values must be truthy, a lock of 0 reads as unlocked in the queue file
+            lane_context.variables["bot_id"] = lane + 1
+            lane_context.variables["driver"] = InitializeApp._get_driver(
+                lane_context.variables["config"], browser_name, browser_version, lane + 1
+            )
+            InitializeApp._check_recording(
+                lane_context.variables["config"], driver=lane_context.variables["driver"], bot_id=lane + 1
+            )
+
+            Login().execute(lane_context)
+            if lane_context.terminate:
+                logger.warning("Pipeline lane %s failed to log in, skipping it.", lane + 1)
+                continue
+            self.lanes.append(lane_context)
+            self._idle.put(lane_context)
+
+        if not self.lanes:
+            raise RuntimeError("No pipeline lane could be started.")
+        logger.info("Pipeline started with %s lane(s).", len(self.lanes))
+
+    def _close_lanes(self):
+        """Quit the browser session of every lane."""
+        for lane_context in self.lanes:
+            try:
+                stop_recording(lane_context.variables["bot_id"])
+                lane_context.variables["driver"].quit()
+            except Exception as e:
+                logger.error("Error while closing pipeline lane: %s", e)
+
+    def _front_stage(self):
+        """Claim items and read their client data on idle lanes."""
+        try:
+            while not self.context.terminate:
+                lane_context = self._idle.get()
+                PickItem._pick_new_item(lane_context)
+                if not lane_context.variables.get("item"):
+                    logger.info("No item found, draining the pipeline.")
+                    break
+
+                self._execute(WorkItemData(), lane_context)
+                self._ready.put(lane_context)
+        except Exception as e:
+            logger.error("Error in pipeline front stage: %s", e)
+        finally:
+            self._ready.put(None)
+
+    def _back_stage(self):
+        """Hash and confirm the items handed over by the front stage."""
+        while True:
+            lane_context = self._ready.get()
+            if lane_context is None:
+                break
+
+            variables = lane_context.variables
+            if variables.get("client_data") and variables.get("status") != "failed":
+                self._execute(HashData(), lane_context)
+            if variables.get("hashed_data") and variables.get("status") != "failed":
+                self._execute(UpdateWorkItem(), lane_context)
+            else:
+                variables["status"] = "failed"
+
+            if variables.get("status") == "failed":
+                self._recover_lane(lane_context)
+            PickItem._report_item_status(lane_context)
+            self._idle.put(lane_context)
+
+    @staticmethod
+    def _execute(state, lane_context):
+        """Execute one state on a lane inside its trace span."""
+        status_before = lane_context.variables.get("status")
+        mark_state(state, lane_context)
+        with state_span(state, lane_context) as span:
+            state.execute(lane_context)
+            record_state_outcome(span, lane_context, status_before)
+
+    @staticmethod
+    def _recover_lane(lane_context):
+        """Close the windows a failed item left open and return to the main window."""
+        try:
+            driver = lane_context.variables["driver"]
+            handles = driver.window_handles
+            for window_handle in handles[1:]:
+                driver.switch_to.window(window_handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception as e:
+            logger.error("Error while recovering pipeline lane: %s", e)
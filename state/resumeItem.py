@@ -0,0 +1,36 @@
+import logging
+
+from StateMachine import State
+
+from reusables.custom_exception import CustomException
+from sub_process.work_item_data import work_item_update_page_init
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeItem(State):
+    """State to reopen the update page of an item restored from a checkpoint."""
+
+    def execute(self, context):
+        """Navigates to the update page without reading the client data again."""
+        try:
+            logger.info("Executing ResumeItem State...")
+            driver = context.variables["driver"]
+            work_item = context.variables["item"]
+            work_item_update_page_init(driver, work_item["item"]["Url"])
+        except (CustomException, Exception) as e:
+            logger.error("Error in ResumeItem.execute: %s", e)
+            context.variables["status"] = "failed"
+
+    def next_state(self, context):
+        """Continues with the first step that has not finished yet."""
+        if context.variables.get("status") == "failed":
+            from state.pickItem import PickItem
+            return PickItem()
+        if context.variables.get("hashed_data"):
+            logger.info("Hashed data restored, proceeding to UpdateWorkItem state.")
+            from state.updateWorkItem import UpdateWorkItem
+            return UpdateWorkItem()
+        logger.info("Client data restored, proceeding to HashData state.")
+        from state.hashData import HashData
+        return HashData()
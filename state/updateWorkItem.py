@@ -1,7 +1,11 @@
+import logging
+
 from StateMachine import State
 from sub_process.update_work_item_data import update_work_item_data
 from reusables.custom_exception import CustomException
 
+logger = logging.getLogger(__name__)
+
 
 class UpdateWorkItem(State):
     """State responsible for updating work item data."""
@@ -9,7 +13,7 @@ class UpdateWorkItem(State):
     def execute(self, context):
         """Executes the work item update process."""
         try:
-            print("Executing UpdateWorkItem State...")
+            logger.info("Executing UpdateWorkItem State...")
             driver = context.variables["driver"]
             hashed_data = context.variables.get("hashed_data")
 
@@ -23,11 +27,11 @@ class UpdateWorkItem(State):
                     break
 
             context.variables["is_update"] = is_update
-            print(f"Work item updated: {is_update}")
+            logger.info("Work item updated: %s", is_update)
             context.variables["status"] = "success"
 
         except (CustomException, Exception) as e:
-            print(f"Error in UpdateWorkItem.execute: {e}")
+            logger.error("Error in UpdateWorkItem.execute: %s", e)
             # context.terminate = True
             context.variables["status"] = "failed"
 
@@ -1,5 +1,6 @@
 from automation.sha1.sha1_Read.Sha1_Output_Read import Sha1OutputRead
 from automation.sha1.sha1_write.Sha1_Data_Write import Sha1DataWrite
+from reusables.artifact_store import artifact_store
 from reusables.custom_exception import CustomException
 
 
@@ -35,6 +36,6 @@ def hash_data_init(driver, data_to_hash: str) -> str:
         return sha1_hashed_data
 
     except (CustomException, Exception) as e:
-        driver.get_screenshot_as_file(f'../Screenshots/{function_name}.png')
+        artifact_store.capture(driver, function_name, e)
         driver.back()
         raise e
@@ -1,6 +1,7 @@
 from automation.login.acme_login_write.Acme_Login_UserName_Write import AcmeLoginUserNameWrite
 from automation.login.acme_login_write.Acme_Login_Password_Write import AcmeLoginPasswordWrite
 from automation.login.acme_login_navigate.Acme_Login_NavigateTo_DashBoard import AcmeLoginNavigateToDashBoard
+from reusables.artifact_store import artifact_store
 from reusables.custom_exception import CustomException
 
 
@@ -25,6 +26,5 @@ def login_init(driver, user_name: str, password: str) -> bool:
 
         return True
     except (CustomException, Exception) as e:
-        print("take screenshot")
-        driver.get_screenshot_as_file(f'../Screenshots/{function_name}.png')
+        artifact_store.capture(driver, function_name, e)
         raise  # Re-raise the exception after logging it
@@ -1,11 +1,20 @@
+import threading
+
 import openpyxl
 
+# Serializes access to the queue workbook when several sessions share one process
+_queue_lock = threading.RLock()
+
 
 def get_item(bot_id, file_path="../data3.xlsx"):
     """
     Get the first item matching the criteria from the Excel sheet.
     """
+    with _queue_lock:
+        return _get_item(bot_id, file_path)
 
+
+def _get_item(bot_id, file_path):
     try:
         workbook = openpyxl.load_workbook(file_path)
         sheet = workbook.active
@@ -44,6 +53,11 @@ def update_item(row_idx, updated_values, file_path="../data3.xlsx"):
     """
     Updates a specific row in the Excel file.
     """
+    with _queue_lock:
+        _update_item(row_idx, updated_values, file_path)
+
+
+def _update_item(row_idx, updated_values, file_path):
     try:
         workbook = openpyxl.load_workbook(file_path)
         sheet = workbook.active
@@ -68,6 +82,11 @@ def check_item_bot(bot_id, row_idx):
     Checks if an item is locked by a specific bot.
     """
     file_path = "../data3.xlsx"
+    with _queue_lock:
+        return _check_item_bot(bot_id, row_idx, file_path)
+
+
+def _check_item_bot(bot_id, row_idx, file_path):
     try:
         workbook = openpyxl.load_workbook(file_path)
         sheet = workbook.active
@@ -5,6 +5,7 @@ from automation.work_item_update_page.work_item_update_page_select.Work_Item_Upd
 from automation.work_item_update_page.work_item_update_page_write.Work_Item_Update_page_Write import \
     WorkItemUpdatePageWrite
 
+from reusables.artifact_store import artifact_store
 from reusables.custom_exception import CustomException
 
 
@@ -26,5 +27,5 @@ def update_work_item_data(driver, client_data: str) -> bool:
         return _is_success
     except CustomException as e:
         print(f"Error in {function_name}: {e}")
-        driver.get_screenshot_as_file(f'../Screenshots/{function_name}.png')
+        artifact_store.capture(driver, function_name, e)
         raise e  # Re-raise the exception after logging it
@@ -1,6 +1,7 @@
 from automation.work_item_page.work_item_page_navigate.Work_Item_Page_NavigateTo_Update_Page import \
     WorkItemPageNavigateToUpdatePage
 from automation.work_item_page.work_item_page_read.Work_Item_Client_Data_Read import WorkItemClientDataRead
+from reusables.artifact_store import artifact_store
 from reusables.custom_exception import CustomException
 
 
@@ -21,26 +22,48 @@ def work_item_data_init(driver, work_item_url: str) -> str:
         client_data = build_data_for_sha1(client_data)
 
         # Step 3: Navigate to update page
-        work_item_page_navigate_to_update_page = WorkItemPageNavigateToUpdatePage(driver)
-        work_item_page_navigate_to_update_page.start()
-
-        # Handle window switching
-        original_window = driver.current_window_handle
-        driver_position = driver.get_window_position()
-        for window_handle in driver.window_handles:
-            if window_handle != original_window:
-                driver.switch_to.window(window_handle)
-                driver.set_window_position(driver_position['x'], driver_position['y'])
-                break
+        _navigate_to_update_page(driver)
 
         return client_data
 
     except (CustomException, Exception) as e:
         print(f"CustomException in {function_name}: {e}")
-        driver.get_screenshot_as_file(f'../Screenshots/{function_name}.png')
+        artifact_store.capture(driver, function_name, e)
         raise e  # Re-raise after logging
 
 
+def work_item_update_page_init(driver, work_item_url: str) -> bool:
+    """
+    Open the update page of a work item without reading its client data again.
+    Used when resuming an item whose client data was already read.
+    """
+    function_name = "work_item_update_page_sub_process"
+    try:
+        driver.get(work_item_url)
+        _navigate_to_update_page(driver)
+        return True
+
+    except (CustomException, Exception) as e:
+        print(f"CustomException in {function_name}: {e}")
+        artifact_store.capture(driver, function_name, e)
+        raise e  # Re-raise after logging
+
+
+def _navigate_to_update_page(driver):
+    """Click through to the update page and switch to the window it opens."""
+    work_item_page_navigate_to_update_page = WorkItemPageNavigateToUpdatePage(driver)
+    work_item_page_navigate_to_update_page.start()
+
+    # Handle window switching
+    original_window = driver.current_window_handle
+    driver_position = driver.get_window_position()
+    for window_handle in driver.window_handles:
+        if window_handle != original_window:
+            driver.switch_to.window(window_handle)
+            driver.set_window_position(driver_position['x'], driver_position['y'])
+            break
+
+
 def build_data_for_sha1(client_data: str) -> str:
     """Builds a string for SHA1 hash from the client information."""
     client_id, client_name, client_country = "", "", ""